@@ -0,0 +1,171 @@
+# bench.py
+"""Headless, seeded micro-benchmarks for the update, collision and draw paths.
+
+    python bench.py                       # print a table
+    python bench.py --save base.json      # record a baseline
+    python bench.py --compare base.json   # flag p50 regressions (exit 1)
+"""
+from __future__ import annotations
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+import pygame
+
+import difficulty
+import render
+from settings import WIDTH, HEIGHT, TILE, ROWS, SIM_HZ, SIM_DT, COLOR_BG
+from entities import Player
+from lanetypes import COLLIDE_HIT
+from movers import CAR_PALETTE
+from sim import Simulation
+
+DT = SIM_DT
+SCORE_LEVELS = (0, 30, 60, 100)   # 100 is past every SpeedProfile cap
+WARMUP_TICKS = 5 * SIM_HZ         # let traffic reach steady state first
+
+
+def _percentiles(samples_ns: list[int]) -> dict:
+    a = np.asarray(samples_ns, dtype=np.float64) / 1000.0  # us
+    p50, p95, p99 = np.percentile(a, (50, 95, 99))
+    return {
+        "calls": len(a),
+        "p50_us": round(float(p50), 2),
+        "p95_us": round(float(p95), 2),
+        "p99_us": round(float(p99), 2),
+        "per_sec": round(1e6 / max(float(a.mean()), 1e-9), 1),
+    }
+
+def _time(fn, n: int) -> list[int]:
+    out = []
+    clock = time.perf_counter_ns
+    for _ in range(n):
+        t0 = clock()
+        fn()
+        out.append(clock() - t0)
+    return out
+
+
+def bench_level(screen: pygame.Surface, score: int, seed: int, n: int) -> dict:
+    sim = Simulation(seed, start_gy=score)
+    world = sim.world
+    cam = sim.camera_y_px
+    for _ in range(WARMUP_TICKS):
+        world.update(DT, cam, score)
+
+    # A scratch player that never dies, parked on a traffic lane if there is one in view
+    probe = Player(gx=sim.player.gx, gy=sim.player.gy, score=score)
+    base = int(cam // TILE)
+    for gy in range(base, base + ROWS):
+        if world.get_lane(gy).ltype.collision == COLLIDE_HIT:
+            probe.gy = gy
+            break
+
+    def collide():
+        probe.alive = True
+        world.check_collisions_and_water(probe, DT)
+
+    lanes = [world.get_lane(gy) for gy in range(base, base + ROWS + 1)]
+    def draw_lanes_uncached():
+        for lane in lanes:
+            render.draw_lane(screen, lane, cam)
+
+    def frame():
+        world.update(DT, cam, score)
+        collide()
+        screen.fill(COLOR_BG)
+        render.draw_world(screen, world, cam)
+        render.draw_player(screen, probe, cam)
+
+    sy = HEIGHT // 2
+    results = {
+        "movers": len(world.movers),
+        "World.update": _percentiles(_time(lambda: world.update(DT, cam, score), n)),
+        "World.check_collisions_and_water": _percentiles(_time(collide, n)),
+        "render.draw_world": _percentiles(_time(lambda: render.draw_world(screen, world, cam), n)),
+        "render.draw_lane x lanes (uncached)": _percentiles(_time(draw_lanes_uncached, max(1, n // 4))),
+        "render.draw_player": _percentiles(_time(lambda: render.draw_player(screen, probe, cam), n)),
+        "render.draw_car (sedan)": _percentiles(_time(lambda: render.draw_car(screen, 100, sy, 1, CAR_PALETTE[0], 1), n)),
+        "render.draw_car (bus)": _percentiles(_time(lambda: render.draw_car(screen, 100, sy, 3, CAR_PALETTE[1], -1), n)),
+        "render.draw_log": _percentiles(_time(lambda: render.draw_log(screen, 100, sy, 3), n)),
+        "render.draw_train": _percentiles(_time(lambda: render.draw_train(screen, 0, sy, 5, 1), n)),
+    }
+    f = _percentiles(_time(frame, n))
+    f["fps"] = f.pop("per_sec")
+    results["frame (no flip)"] = f
+    return results
+
+
+def run(seed: int, n: int) -> dict:
+    pygame.display.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    out = {"seed": seed, "iterations": n, "levels": {}}
+    for score in SCORE_LEVELS:
+        level = bench_level(screen, score, seed, n)
+        level["mult"] = [round(m, 3) for m in difficulty.mover_multipliers(score)]
+        out["levels"][str(score)] = level
+    pygame.quit()
+    return out
+
+
+def print_table(res: dict) -> None:
+    for score, level in res["levels"].items():
+        car, log, trn = level["mult"]
+        print(f"\n== score {score}  (movers={level['movers']}  mult car={car} log={log} train={trn})")
+        print(f"{'path':40s} {'p50 us':>9s} {'p95 us':>9s} {'p99 us':>9s} {'per sec':>10s}")
+        for name, r in level.items():
+            if not isinstance(r, dict):
+                continue
+            rate = r.get("per_sec", r.get("fps"))
+            print(f"{name:40s} {r['p50_us']:9.1f} {r['p95_us']:9.1f} {r['p99_us']:9.1f} {rate:10.1f}")
+
+def compare(res: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Names of paths whose p50 got slower than baseline by more than tolerance."""
+    regressions = []
+    for score, level in res["levels"].items():
+        base_level = baseline.get("levels", {}).get(score, {})
+        for name, r in level.items():
+            b = base_level.get(name)
+            if not isinstance(r, dict) or not isinstance(b, dict):
+                continue
+            if r["p50_us"] > b["p50_us"] * (1.0 + tolerance):
+                regressions.append(f"score {score} {name}: p50 {b['p50_us']:.1f} -> {r['p50_us']:.1f} us")
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark update/collision/draw paths headless.")
+    ap.add_argument("--seed", type=int, default=1234)
+    ap.add_argument("-n", "--iterations", type=int, default=500)
+    ap.add_argument("--save", metavar="JSON", help="write results as a baseline")
+    ap.add_argument("--compare", metavar="JSON", help="compare against a saved baseline")
+    ap.add_argument("--tolerance", type=float, default=0.15, help="allowed p50 slowdown (0.15 = 15%%)")
+    args = ap.parse_args()
+
+    res = run(args.seed, args.iterations)
+    print_table(res)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(res, f, indent=2)
+        print(f"\nbaseline written to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(res, baseline, args.tolerance)
+        if regressions:
+            print("\nREGRESSIONS:")
+            for line in regressions:
+                print("  " + line)
+            sys.exit(1)
+        print("\nno regressions")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+# bot.py
+"""Autopilot: a time-budgeted search over (gx, gy, t) on the simulation's own forecasts.
+
+Traffic is a closed-form function of the phase clocks (see world.py), so every lane
+can be forecast over the planning horizon without stepping the world. The search
+runs best-first from the player's state, one node per move opportunity, and stops
+at its time budget with the best plan found so far.
+
+    python bot.py --games 20 --budget-ms 2     # headless soak run, reports nodes/sec
+"""
+from __future__ import annotations
+import argparse
+import heapq
+import math
+import time
+
+import numpy as np
+
+import difficulty
+from settings import TILE, COLS, SIM_DT, SIM_HZ, MOVE_COOLDOWN
+from sim import Simulation, NOOP, UP, DOWN, LEFT, RIGHT, ACTION_DELTAS
+from lanetypes import COLLIDE_RIDE
+from world import World, Lane
+
+HORIZON_TICKS = 90                                     # how far ahead a plan must survive
+STEP_TICKS = math.ceil(MOVE_COOLDOWN * SIM_HZ - 1e-9)  # ticks between two moves
+SAFETY_PX = 3                                          # slack for phase rounding
+# Extra slack per tick of lookahead, as a fraction of a tick's travel: the forecast holds
+# the speed multiplier fixed, but it grows with the score along the plan.
+DRIFT_SLACK = 0.05
+
+EXIT_RESERVE_S = 0.0001   # left for the bookkeeping after the search stops
+COST_DECAY = 0.9          # per plan, for the node / forecast cost estimates
+_LATE = object()   # forecast() result when there is no time left to build one
+
+# Expansion order: forward first, so ties favour progress
+ACTIONS = (UP, LEFT, RIGHT, NOOP, DOWN)
+
+
+class LaneForecast:
+    """Mover spans of one traffic lane for ticks 0..horizon from now.
+
+    Road/rail lanes keep danger[m], a bitmask of the columns a player would be hit in
+    at tick m (swept by one tick of travel); water lanes keep the log spans for the
+    per-tick carry simulation.
+    """
+
+    def __init__(self, world: World, lane: Lane, spawns: dict, horizon: int, kind_mult: tuple):
+        kind = lane.ltype.mover_kind
+        mult = kind_mult[kind]
+        phase = world.phase[kind]
+        self.water = lane.ltype.collision == COLLIDE_RIDE
+        self.v = lane.direction * lane.speed_px * mult * SIM_DT   # px per tick
+
+        # Every spawn that is live now or appears within the horizon; one not yet spawned
+        # sits beyond its entry edge, so including it early is harmless.
+        k0 = lane.first_live_spawn(phase)
+        k1 = math.floor((phase + mult * SIM_DT * horizon - lane.spawn_phase0) / lane.spawn_period)
+        w, x0, t0 = [], [], []
+        for k in range(k0, k1 + 1):
+            p = spawns.get(k)
+            if p is None:
+                p = spawns[k] = lane.spawn_params(k)
+            w.append(p[0]); x0.append(p[1]); t0.append(p[2])
+        if not w:
+            self.left = self.right = [[] for _ in range(horizon + 1)]
+            self.danger = [0] * (horizon + 1)
+            return
+
+        x_now = np.asarray(x0) + lane.direction * lane.speed_px * (phase - np.asarray(t0))
+        m = np.arange(horizon + 1)[:, None]
+        left = (x_now[None, :] + self.v * m).astype(np.int64)
+        right = left + np.asarray(w) * TILE
+        slack = (SAFETY_PX + abs(self.v) * DRIFT_SLACK * m).astype(np.int64)
+
+        if self.water:
+            # Shrink logs by the slack so the plan only counts on solid footing
+            self.left = (left + slack).tolist()
+            self.right = (right - slack).tolist()
+            return
+
+        sweep = int(abs(self.v)) + 1
+        cols = np.arange(COLS) * TILE
+        lo = (left - sweep - slack)[:, :, None]
+        hi = (right + sweep + slack)[:, :, None]
+        hit = ((lo < cols + TILE) & (cols < hi)).any(axis=1)      # (horizon + 1, COLS)
+        self.danger = (hit.astype(np.int64) @ (1 << np.arange(COLS))).tolist()
+
+    def log_at(self, m: int, a: int, b: int) -> bool:
+        for l, r in zip(self.left[m], self.right[m]):
+            if l < b and a < r:
+                return True
+        return False
+
+
+class Autopilot:
+    """Input source that plans a move whenever the cooldown allows one.
+
+    next_action(sim) has the same shape as InputQueue.next_action, so main.py can
+    swap it in. Each plan gets budget_ms of wall time; when that runs out the best
+    plan found so far is used, and timeouts are counted. After begin_frame() the
+    budget is shared by every plan until the next begin_frame() call instead, so a
+    frame that runs several ticks still spends at most budget_ms planning.
+    """
+
+    def __init__(self, budget_ms: float = 2.0, horizon: int = HORIZON_TICKS):
+        self.budget_s = budget_ms / 1000.0
+        self.horizon = horizon
+        self.nodes = 0
+        self.plans = 0
+        self.timeouts = 0
+        self.plan_s = 0.0
+        # Slowest recent node expansion and forecast build, in thread CPU time so a
+        # preempted sample doesn't stick (decaying maxima): the search only starts one
+        # when it still fits in the budget, so budget_ms is an upper bound.
+        self.pop_s = 0.0
+        self.forecast_s = 0.0
+        self.frame_deadline: float | None = None   # set by begin_frame()
+        self._seed: int | None = None
+        self._spawns: dict[int, dict] = {}   # gy -> {k: spawn params}, pure per (seed, gy, k)
+
+    # --- stats ---------------------------------------------------------------
+    @property
+    def nodes_per_sec(self) -> float:
+        return self.nodes / self.plan_s if self.plan_s > 0 else 0.0
+
+    def summary_line(self) -> str:
+        return (f"bot {self.nodes_per_sec / 1000:.1f}k nodes/s  plans {self.plans}  "
+                f"timeouts {self.timeouts}")
+
+    # --- planning ------------------------------------------------------------
+    def begin_frame(self) -> None:
+        """Start one budget_ms shared by all plans until the next call (once per rendered frame)."""
+        self.frame_deadline = time.perf_counter() + self.budget_s
+
+    def next_action(self, sim: Simulation) -> int:
+        if not sim.player.alive or not sim.move_ready():
+            return NOOP
+        return self.plan(sim)
+
+    def plan(self, sim: Simulation) -> int:
+        t_start = time.perf_counter()
+        end = self.frame_deadline if self.frame_deadline is not None else t_start + self.budget_s
+        deadline = end - EXIT_RESERVE_S
+        self.pop_s *= COST_DECAY
+        self.forecast_s *= COST_DECAY
+        world, player = sim.world, sim.player
+        if world.seed != self._seed:
+            self._seed = world.seed
+            self._spawns.clear()
+        for gy in [gy for gy in self._spawns if gy < player.gy - 4]:
+            del self._spawns[gy]
+        kind_mult = difficulty.mover_multipliers(player.score)
+
+        forecasts: dict[int, LaneForecast | None] = {}
+        def forecast(gy: int):
+            """The lane's forecast, or _LATE if building it could overrun the budget."""
+            fc = forecasts.get(gy, _LATE)
+            if fc is _LATE:
+                lane = world.get_lane(gy)
+                if lane.ltype.mover_kind is None:
+                    fc = None
+                else:
+                    if time.perf_counter() + self.forecast_s > deadline:
+                        return _LATE
+                    c0 = time.thread_time()
+                    fc = LaneForecast(world, lane, self._spawns.setdefault(gy, {}), self.horizon, kind_mult)
+                    self.forecast_s = max(self.forecast_s, time.thread_time() - c0)
+                forecasts[gy] = fc
+            return fc
+
+        H = self.horizon
+        mid = COLS // 2
+        root = (player.gx, player.gy, player.drift_px, 0)
+        seen = {(player.gx, player.gy, 0, int(player.drift_px))}
+        heap = [(-player.gy, 0, 0, root, NOOP)]
+        counter = 1
+        best_key, best_action = None, NOOP
+        nodes = 0
+        timed_out = False
+
+        while heap and not timed_out:
+            if time.perf_counter() + self.pop_s > deadline:
+                timed_out = True
+                break
+            c_pop = time.thread_time()
+            _, _, _, (gx, gy, drift, m), first = heapq.heappop(heap)
+            nodes += 1
+            for action in ACTIONS:
+                dx, dy = ACTION_DELTAS[action]
+                ngx, ngy = gx + dx, gy + dy
+                if action != NOOP and not world.can_step_to(ngx, ngy):
+                    continue
+                fc = forecast(ngy)
+                if fc is _LATE:
+                    timed_out = True
+                    break
+                child = self._survive(fc, ngx, ngy, drift, m, min(STEP_TICKS, H - m))
+                if child is None:
+                    continue
+                cgx, cdrift, cm = child
+                key = (cgx, ngy, cm, int(cdrift))
+                if key in seen:
+                    continue
+                seen.add(key)
+                act = action if m == 0 else first
+                # Survive longest first, then furthest forward, then stay central
+                leaf_key = (cm, ngy, -abs(cgx - mid))
+                if best_key is None or leaf_key > best_key:
+                    best_key, best_action = leaf_key, act
+                if cm < H:
+                    heapq.heappush(heap, (-ngy, cm, counter, (cgx, ngy, cdrift, cm), act))
+                    counter += 1
+            self.pop_s = max(self.pop_s, time.thread_time() - c_pop)
+
+        elapsed = time.perf_counter() - t_start
+        self.nodes += nodes
+        self.plan_s += elapsed
+        self.plans += 1
+        self.timeouts += timed_out
+        return best_action
+
+    @staticmethod
+    def _survive(fc: LaneForecast | None, gx: int, gy: int, drift: float, m: int, ticks: int):
+        """Stand at (gx, gy) from tick m + 1 for `ticks` ticks, replaying the simulation's
+        collision and carry rules against the forecast. Returns (gx, drift, m) or None."""
+        if fc is None:
+            return gx, 0.0, m + ticks          # grass: nothing moves
+        if not fc.water:
+            danger = fc.danger
+            for t in range(m + 1, m + ticks + 1):
+                if (danger[t] >> gx) & 1:
+                    return None
+            return gx, 0.0, m + ticks
+
+        v = fc.v
+        for t in range(m + 1, m + ticks + 1):
+            x = int(gx * TILE + drift)
+            if not fc.log_at(t, x, x + TILE):
+                return None
+            drift += v
+            steps = int(drift / TILE)
+            if steps:
+                ngx = gx + steps
+                if ngx > COLS - 1:
+                    gx, drift = COLS - 1, 0.0
+                elif ngx < 0:
+                    gx, drift = 0, 0.0
+                else:
+                    gx = ngx
+                    drift -= steps * TILE
+            if gx <= 0 and drift < 0:
+                drift = 0.0
+            if gx >= COLS - 1 and drift > 0:
+                drift = 0.0
+            x = int(gx * TILE + drift)
+            if not fc.log_at(t, x, x + TILE):
+                return None
+        return gx, drift, m + ticks
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Headless autopilot soak run.")
+    ap.add_argument("--games", type=int, default=10)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--budget-ms", type=float, default=2.0)
+    ap.add_argument("--max-ticks", type=int, default=120 * SIM_HZ)
+    args = ap.parse_args()
+
+    bot = Autopilot(args.budget_ms)
+    t0 = time.perf_counter()
+    ticks = 0
+    scores = []
+    for i in range(args.games):
+        sim = Simulation(args.seed + i)
+        while sim.player.alive and sim.ticks < args.max_ticks:
+            sim.step(SIM_DT, bot.next_action(sim))
+        ticks += sim.ticks
+        scores.append(sim.player.score)
+        print(f"seed={args.seed + i} score={sim.player.score} ticks={sim.ticks} "
+              f"{'died' if not sim.player.alive else 'alive'}")
+    elapsed = time.perf_counter() - t0
+
+    print(f"games={args.games} ticks/s={ticks / max(elapsed, 1e-9):.0f} "
+          f"score mean={sum(scores) / len(scores):.1f} max={max(scores)}")
+    print(f"plans={bot.plans} timeouts={bot.timeouts} nodes={bot.nodes} "
+          f"nodes/s={bot.nodes_per_sec:.0f} mean plan={bot.plan_s / max(bot.plans, 1) * 1000:.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+# crowd.py
+"""Crowd mode: many agents (bots or ghosts) sharing one World.
+
+Agents are struct-of-arrays columns, like the mover table. A tick moves every agent the
+cooldown allows, advances the world once (the camera and the difficulty follow the
+leader), then resolves collisions and log carry for all agents together, one lookup
+per occupied lane and one bisection per agent (MoverTable.first_overlaps) rather than
+agents x movers tests. Only lanes holding an agent get movers; the lanes in the
+camera's view are kept too when a spectator watches (view_lanes). Lanes are
+closed-form, so either way a crowd of one plays exactly like Simulation.
+
+    python crowd.py --agents 500                # headless, reports ticks/s
+    python crowd.py --agents 200 --render       # watch as a spectator
+"""
+from __future__ import annotations
+import argparse
+import time
+
+import numpy as np
+
+from settings import TILE, COLS, MOVE_COOLDOWN, CAMERA_MARGIN_TILES, SIM_DT, SIM_HZ
+from entities import (
+    DEATH_NONE, DEATH_CAR, DEATH_TRAIN, DEATH_DROWNED, DEATH_SWEPT, DEATH_BEHIND, DEATH_NAMES,
+)
+from lanetypes import COLLIDE_HIT, COLLIDE_RIDE, LANE_TYPES
+from movers import KIND_TRAIN
+from sim import NOOP, UP, DOWN, LEFT, RIGHT, ACTION_DELTAS, start_cell
+from world import World
+
+_DX = np.array([ACTION_DELTAS[a][0] for a in range(len(ACTION_DELTAS))])
+_DY = np.array([ACTION_DELTAS[a][1] for a in range(len(ACTION_DELTAS))])
+_RULE = np.array([t.collision for t in LANE_TYPES])
+
+
+class Crowd:
+    def __init__(self, n: int, seed: int | None = None, start_gy: int = 0, view_lanes: bool = False):
+        self.n = n
+        self.start_gy = start_gy
+        self.view_lanes = view_lanes   # keep traffic on every lane in view, for rendering
+        self.world = World(seed, start_gy)
+        self.reset(seed)
+
+    def reset(self, seed: int | None = None) -> None:
+        """Start a new game for every agent, on one start cell like Simulation."""
+        world = self.world
+        world.reset(seed, self.start_gy)
+        self.seed = world.seed
+        self.rng = np.random.default_rng(self.seed)  # for policies
+
+        n = self.n
+        gx, gy = start_cell(world, self.start_gy)
+        self.gx = np.full(n, gx, dtype=np.int64)
+        self.gy = np.full(n, gy, dtype=np.int64)
+        self.drift = np.zeros(n)                      # see Player.drift_px
+        self.alive = np.ones(n, dtype=bool)
+        self.score = np.full(n, self.start_gy, dtype=np.int64)
+        self.death = np.full(n, DEATH_NONE, dtype=np.int8)
+        self.last_move = np.full(n, -MOVE_COOLDOWN)
+        self.camera_y_px = float(self.start_gy * TILE)
+        self.time = 0.0
+        self.ticks = 0
+
+    @property
+    def leader(self) -> int:
+        """Index of the alive agent furthest up (or of the best score when none is)."""
+        if self.alive.any():
+            return int(np.flatnonzero(self.alive)[self.gy[self.alive].argmax()])
+        return int(self.score.argmax())
+
+    def step(self, dt: float, actions: np.ndarray) -> int:
+        """Advance one tick; actions holds one action per agent. Returns how many are alive."""
+        if not self.alive.any():
+            return 0
+        self.time += dt
+        self.ticks += 1
+        self.try_moves(np.asarray(actions))
+        self.update_world(dt)
+        self.collide(dt)
+        return int(np.count_nonzero(self.alive))
+
+    def try_moves(self, actions: np.ndarray) -> None:
+        dx, dy = _DX[actions], _DY[actions]
+        i = np.flatnonzero(self.alive & ((dx != 0) | (dy != 0))
+                           & (self.time - self.last_move >= MOVE_COOLDOWN))
+        if i.size == 0:
+            return
+        world = self.world
+        ngx, ngy = self.gx[i] + dx[i], self.gy[i] + dy[i]
+        ok = (ngx >= 0) & (ngx < COLS) & (ngy >= world.lowest_gy)
+        # Trees: one lane lookup per target row
+        rows, inv = np.unique(ngy, return_inverse=True)
+        lowest = world.lowest_gy
+        masks = np.array([world.get_lane(g).blocked_mask if g >= lowest else 0 for g in rows.tolist()])
+        ok &= ((masks[inv] >> np.clip(ngx, 0, COLS - 1)) & 1) == 0
+
+        i, ngx, ngy = i[ok], ngx[ok], ngy[ok]
+        self.gx[i] = ngx
+        self.gy[i] = ngy
+        self.last_move[i] = self.time
+        # scoring: max forward progress (gy)
+        self.score[i] = np.maximum(self.score[i], ngy)
+
+    def update_world(self, dt: float) -> None:
+        alive = self.alive
+        world = self.world
+        # Camera follows the leader's upward progress; traffic speeds follow its score
+        lead = self.leader
+        target_camera = max(0.0, (int(self.gy[lead]) - CAMERA_MARGIN_TILES) * TILE)
+        self.camera_y_px = max(self.camera_y_px, target_camera)
+        world.update(dt, self.camera_y_px, int(self.score[lead]), np.unique(self.gy[alive]).tolist(),
+                     self.view_lanes)
+
+        # Agents whose row was evicted from the lane ring are out
+        behind = alive & (self.gy < world.lowest_gy)
+        if behind.any():
+            self.kill(np.flatnonzero(behind), DEATH_BEHIND)
+
+    def kill(self, i: np.ndarray, cause) -> None:
+        self.alive[i] = False
+        self.death[i] = cause
+
+    def collide(self, dt: float) -> None:
+        """check_collisions_and_water for every alive agent at once."""
+        world, movers = self.world, self.world.movers
+        i = np.flatnonzero(self.alive)
+        if i.size == 0:
+            return
+        rows, inv = np.unique(self.gy[i], return_inverse=True)
+        rule = _RULE[[world.get_lane(g).kind for g in rows.tolist()]][inv]
+
+        # Reset drift when not on water so it doesn't leak across lanes.
+        self.drift[i[rule != COLLIDE_RIDE]] = 0.0
+
+        h = i[rule == COLLIDE_HIT]
+        if h.size:
+            gy = self.gy[h]
+            a = self.gx[h] * TILE
+            b = a + TILE
+            # Swept test, as in World: widen by how far the lane's traffic moves in a tick
+            if movers.n:
+                movers.ensure_sorted()
+                lo = np.searchsorted(movers.gy, gy, "left")
+                j = np.minimum(lo, movers.n - 1)
+                d = np.where((lo < movers.n) & (movers.gy[j] == gy),
+                             movers.speed[j] * dt * movers.direction[j], 0.0)
+                a += np.trunc(np.minimum(d, 0.0)).astype(np.int64)
+                b += np.trunc(np.maximum(d, 0.0) + 0.999).astype(np.int64)
+            j = movers.first_overlaps(gy, a, b)
+            hit = j >= 0
+            if hit.any():
+                self.kill(h[hit], np.where(movers.kind[j[hit]] == KIND_TRAIN, DEATH_TRAIN, DEATH_CAR))
+
+        w = i[rule == COLLIDE_RIDE]
+        if w.size:
+            # If you step/jump into water without a log under you -> immediate death.
+            on_log = self._log_under(w)
+            sunk = on_log < 0
+            self.kill(w[sunk], DEATH_DROWNED)
+            w, on_log = w[~sunk], on_log[~sunk]
+
+            # Carry by the log, then block at the screen edges (see World)
+            drift = self.drift[w] + movers.speed[on_log] * dt * movers.direction[on_log]
+            gx = self.gx[w]
+            steps = np.trunc(drift / TILE).astype(np.int64)
+            ngx = gx + steps
+            moved = steps != 0
+            wall = moved & ((ngx > COLS - 1) | (ngx < 0))
+            inside = moved & ~wall
+            gx = np.where(inside, ngx, np.where(wall, np.clip(ngx, 0, COLS - 1), gx))
+            drift = np.where(wall, 0.0, drift - np.where(inside, steps * TILE, 0))
+            drift[((gx <= 0) & (drift < 0)) | ((gx >= COLS - 1) & (drift > 0))] = 0.0
+            self.gx[w] = gx
+            self.drift[w] = drift
+
+            # After carry/blocking, if not on any log -> water -> death.
+            off = self._log_under(w) < 0
+            self.kill(w[off], DEATH_SWEPT)
+
+    def _log_under(self, i: np.ndarray) -> np.ndarray:
+        x = np.trunc(self.gx[i] * TILE + self.drift[i]).astype(np.int64)
+        return self.world.movers.first_overlaps(self.gy[i], x, x + TILE)
+
+
+def random_actions(crowd: Crowd) -> np.ndarray:
+    """sim.random_policy for every agent."""
+    return crowd.rng.choice(np.array([NOOP, UP, UP, LEFT, RIGHT, DOWN]), size=crowd.n)
+
+
+def play_rendered(crowd: Crowd, speed: float) -> None:
+    import pygame
+    from settings import WIDTH, HEIGHT, FPS, TITLE, COLOR_BG
+    from render import draw_world, draw_crowd
+    from sim import FixedStep
+    from ui import draw_hud
+
+    pygame.display.init()
+    pygame.display.set_caption(f"{TITLE} - crowd of {crowd.n}")
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    clock = pygame.time.Clock()
+    stepper = FixedStep(max_catchup=max(5, int(speed * 5)))
+    running = True
+    while running:
+        dt = clock.tick(FPS) / 1000.0
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                running = False
+        for _ in range(stepper.advance(dt * speed)):
+            if not crowd.step(SIM_DT, random_actions(crowd)):
+                break
+
+        alive = crowd.alive
+        screen.fill(COLOR_BG)
+        draw_world(screen, crowd.world, crowd.camera_y_px, alpha=stepper.alpha)
+        draw_crowd(screen, crowd.gx[alive], crowd.gy[alive], crowd.camera_y_px)
+        draw_hud(screen, int(crowd.score[crowd.leader]), int(crowd.score.max()))
+        pygame.display.flip()
+    pygame.quit()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Many random-policy agents in one shared world.")
+    ap.add_argument("--agents", type=int, default=500)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--max-ticks", type=int, default=60 * SIM_HZ)
+    ap.add_argument("--render", action="store_true", help="watch instead of running headless")
+    ap.add_argument("-s", "--speed", type=float, default=1.0, help="playback speed when rendering")
+    args = ap.parse_args()
+
+    crowd = Crowd(args.agents, args.seed, view_lanes=args.render)
+    if args.render:
+        play_rendered(crowd, args.speed)
+        return
+
+    t0 = time.perf_counter()
+    while crowd.ticks < args.max_ticks and crowd.step(SIM_DT, random_actions(crowd)):
+        pass
+    elapsed = time.perf_counter() - t0
+
+    deaths = np.bincount(crowd.death, minlength=len(DEATH_NAMES))
+    print(f"agents={crowd.n} ticks={crowd.ticks} ticks/s={crowd.ticks / max(elapsed, 1e-9):.0f} "
+          f"agent-ticks/s={crowd.n * crowd.ticks / max(elapsed, 1e-9):.0f}")
+    print(f"score mean={crowd.score.mean():.1f} max={crowd.score.max()} alive={np.count_nonzero(crowd.alive)}")
+    print("  ".join(f"{name}={deaths[c]}" for c, name in enumerate(DEATH_NAMES) if c != DEATH_NONE))
+
+if __name__ == "__main__":
+    main()
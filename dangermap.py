@@ -0,0 +1,117 @@
+# dangermap.py
+"""Fixed-size NumPy grids of the cells around a row, for bots, hints and analytics.
+
+Row r of every grid is lane base + r and column c is board column c. The static part
+(lane kinds, trees) is a pure function of (seed, gy), so when the window scrolls the
+rows still inside it are shifted over and only the rows entering it are read from
+the world. The mover part is recomputed on each update from the mover table rows of
+the window, with a few array operations and no per-mover Python.
+
+    dm = world.danger_map(player.gy)
+    dm.cover[dm.row(gy), gx]      # fraction of the cell under a car or train
+"""
+from __future__ import annotations
+import numpy as np
+
+from settings import TILE, COLS
+from lanetypes import COLLIDE_HIT, COLLIDE_RIDE, LANE_TYPES
+
+MAP_BELOW = 2   # rows kept below the center row
+MAP_ABOVE = 7   # rows kept above it
+
+_CELL_LO = np.arange(COLS) * TILE
+_CELL_HI = _CELL_LO + TILE
+_COL_BITS = 1 << np.arange(COLS)
+_HIT = np.array([t.collision == COLLIDE_HIT for t in LANE_TYPES] + [False])    # index -1: no lane
+_RIDE = np.array([t.collision == COLLIDE_RIDE for t in LANE_TYPES] + [False])
+
+
+class DangerMap:
+    def __init__(self, below: int = MAP_BELOW, above: int = MAP_ABOVE):
+        self.below = below
+        self.rows = below + 1 + above
+        self.base: int | None = None     # gy of row 0
+        self.seed: int | None = None
+        shape = (self.rows, COLS)
+        self.kind = np.full(self.rows, -1, dtype=np.int8)        # LANE_*, -1 below row 0
+        self.blocked = np.zeros(shape, dtype=bool)                # trees; whole row below row 0
+        self.cover = np.zeros(shape, dtype=np.float32)            # fraction under a car/train
+        self.log = np.zeros(shape, dtype=np.float32)              # fraction under a log
+        # Seconds until standing in the cell kills: when the first car/train in view
+        # reaches it at current speeds, 0 in water with no log under it, inf otherwise.
+        self.ttc = np.full(shape, np.inf, dtype=np.float32)
+
+    def row(self, gy: int) -> int:
+        return gy - self.base
+
+    def update(self, world, center_gy: int) -> DangerMap:
+        self._scroll(world, center_gy - self.below)
+        self._movers(world)
+        return self
+
+    def update_static(self, world, center_gy: int) -> DangerMap:
+        """Only kind and blocked (for callers that batch the mover part themselves)."""
+        self._scroll(world, center_gy - self.below)
+        return self
+
+    def _scroll(self, world, base: int) -> None:
+        rows = self.rows
+        if self.seed != world.seed or self.base is None or abs(base - self.base) >= rows:
+            fresh = range(rows)
+        else:
+            d = base - self.base
+            if d == 0:
+                return
+            # Shift the rows that stay in the window; read only the new ones
+            if d > 0:
+                self.kind[:-d] = self.kind[d:]
+                self.blocked[:-d] = self.blocked[d:]
+                fresh = range(rows - d, rows)
+            else:
+                self.kind[-d:] = self.kind[:d]
+                self.blocked[-d:] = self.blocked[:d]
+                fresh = range(-d)
+        self.seed, self.base = world.seed, base
+
+        for r in fresh:
+            gy = base + r
+            if gy < 0:
+                self.kind[r] = -1
+                self.blocked[r] = True
+                continue
+            lane = world.get_lane(gy)
+            self.kind[r] = lane.kind
+            self.blocked[r] = (lane.blocked_mask & _COL_BITS) != 0
+
+    def _movers(self, world) -> None:
+        cover, log, ttc = self.cover, self.log, self.ttc
+        cover.fill(0.0)
+        log.fill(0.0)
+        ttc.fill(np.inf)
+
+        movers = world.movers
+        movers.ensure_sorted()
+        lo, hi = np.searchsorted(movers.gy, (self.base, self.base + self.rows))
+        if lo < hi:
+            # Movers are sorted by row, so each row's movers are one run
+            r = movers.gy[lo:hi] - self.base
+            counts = np.bincount(r, minlength=self.rows)
+            rows = np.flatnonzero(counts)
+            starts = (np.cumsum(counts) - counts)[rows]
+            hit = _HIT[self.kind[rows]]
+
+            left = movers.x[lo:hi, None].astype(np.int64)   # same truncation as first_overlap
+            right = left + movers.w[lo:hi, None] * TILE
+            overlap = np.maximum(np.minimum(right, _CELL_HI) - np.maximum(left, _CELL_LO), 0)
+            frac = np.minimum(np.add.reduceat(overlap, starts) / TILE, 1.0)
+            cover[rows[hit]] = frac[hit]
+            log[rows[~hit]] = frac[~hit]
+
+            # Time for each mover to reach each cell ahead of it (0 if already there)
+            if hit.any():
+                v = (movers.speed[lo:hi] * movers.direction[lo:hi])[:, None]
+                t = np.where(v > 0, (_CELL_LO - right) / v, (left - _CELL_HI) / -v)
+                t = np.where(overlap > 0, 0.0, np.where(t >= 0, t, np.inf))
+                ttc[rows[hit]] = np.minimum.reduceat(t, starts)[hit]
+
+        ttc[_RIDE[self.kind][:, None] & (log == 0)] = 0.0
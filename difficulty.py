@@ -20,19 +20,40 @@ CAR_PROFILE   = SpeedProfile(start_mult=0.45, max_mult=1.10, per_score=0.007)
 LOG_PROFILE   = SpeedProfile(start_mult=0.40, max_mult=1.05, per_score=0.008)
 TRAIN_PROFILE = SpeedProfile(start_mult=0.40, max_mult=1.05, per_score=0.006)
 
-def lane_speed_multiplier(kind: str, score: int) -> float:
-    """Return current speed multiplier for lane kind."""
-    if kind == "road":
-        return CAR_PROFILE.mult(score)
-    if kind == "water":
-        return LOG_PROFILE.mult(score)
-    if kind == "rail":
-        return TRAIN_PROFILE.mult(score)
-    return 1.0
+# Spawn-period clamps (see world.Lane.period_for)
+MIN_SPEED_MULT = 0.20    # 防止除以很小的数导致间隔爆大
+MIN_SPAWN_INTERVAL = 0.35
+MAX_SPAWN_INTERVAL = 4.00
+
+
+@dataclass(frozen=True)
+class Tuning:
+    """Every difficulty knob in one value, so a sweep can swap them per process."""
+    car: SpeedProfile = CAR_PROFILE
+    log: SpeedProfile = LOG_PROFILE
+    train: SpeedProfile = TRAIN_PROFILE
+    min_speed_mult: float = MIN_SPEED_MULT
+    min_spawn_interval: float = MIN_SPAWN_INTERVAL
+    max_spawn_interval: float = MAX_SPAWN_INTERVAL
+
+    @property
+    def profiles(self) -> tuple[SpeedProfile, SpeedProfile, SpeedProfile]:
+        """Indexed by mover kind (car, log, train)."""
+        return self.car, self.log, self.train
+
+# Active tuning. Lanes read it when they are generated, so change it only between games.
+TUNING = Tuning()
+
+def set_tuning(tuning: Tuning) -> None:
+    global TUNING
+    TUNING = tuning
 
 def debug_string(score: int) -> str:
     """For debugging in HUD."""
-    car = CAR_PROFILE.mult(score)
-    log = LOG_PROFILE.mult(score)
-    trn = TRAIN_PROFILE.mult(score)
+    car, log, trn = mover_multipliers(score)
     return f"spd x car:{car:.2f} log:{log:.2f} train:{trn:.2f}"
+
+def mover_multipliers(score: int) -> tuple[float, float, float]:
+    """Speed multipliers indexed by mover kind (car, log, train); computed once per frame."""
+    t = TUNING
+    return t.car.mult(score), t.log.mult(score), t.train.mult(score)
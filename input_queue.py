@@ -0,0 +1,73 @@
+# input_queue.py
+"""Timestamped move buffer between the event loop and the simulation tick.
+
+Presses are queued (up to a fixed depth) instead of being dropped while the move
+cooldown runs, and each one is timed from the key event to the flip that shows it.
+"""
+from __future__ import annotations
+from collections import deque
+import time
+
+import numpy as np
+
+from settings import INPUT_QUEUE_DEPTH
+from sim import Simulation, NOOP
+
+
+class InputQueue:
+    def __init__(self, depth: int = INPUT_QUEUE_DEPTH, window: int = 240):
+        self.depth = depth
+        self.queue: deque[tuple[int, float]] = deque()   # (action, time pressed)
+        self.in_flight: list[float] = []                 # press times applied but not yet on screen
+        self.latencies = deque(maxlen=window)            # seconds, press -> flip
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self.queue)
+
+    def clear(self) -> None:
+        self.queue.clear()
+        self.in_flight.clear()
+
+    def push(self, action: int, t: float | None = None) -> bool:
+        """Queue a move; False if the queue is full and the press was dropped."""
+        if len(self.queue) >= self.depth:
+            self.dropped += 1
+            return False
+        self.queue.append((action, time.perf_counter() if t is None else t))
+        return True
+
+    def next_action(self, sim: Simulation) -> int:
+        """The action for this tick: the oldest queued move once the cooldown allows it."""
+        if not self.queue or not sim.move_ready():
+            return NOOP
+        action, t = self.queue.popleft()
+        self.in_flight.append(t)
+        return action
+
+    def flipped(self, t: float | None = None) -> float | None:
+        """Record that the frame showing the applied moves is on screen; returns the
+        worst latency among them (seconds), or None if no move was applied."""
+        if not self.in_flight:
+            return None
+        now = time.perf_counter() if t is None else t
+        worst = 0.0
+        for t_press in self.in_flight:
+            lat = now - t_press
+            self.latencies.append(lat)
+            worst = max(worst, lat)
+        self.in_flight.clear()
+        return worst
+
+    def percentiles(self) -> tuple[float, float, float] | None:
+        """Rolling input-to-flip (p50, p95, p99) in milliseconds."""
+        if not self.latencies:
+            return None
+        p50, p95, p99 = np.percentile(np.fromiter(self.latencies, dtype=np.float64), (50, 95, 99))
+        return p50 * 1000.0, p95 * 1000.0, p99 * 1000.0
+
+    def summary_line(self) -> str:
+        pct = self.percentiles()
+        if pct is None:
+            return f"input  --  dropped {self.dropped}"
+        return f"input p50 {pct[0]:.1f} p95 {pct[1]:.1f} p99 {pct[2]:.1f} ms  dropped {self.dropped}"
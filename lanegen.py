@@ -0,0 +1,64 @@
+# lanegen.py
+"""Background lane generation: a worker thread builds rows in chunks ahead of the
+camera so the frame loop only copies finished lanes into its ring.
+
+Lanes are a pure function of (seed, gy), so whether a row came from the worker or
+was built on the spot (the worker fell behind) makes no difference to the game.
+"""
+from __future__ import annotations
+import queue
+import threading
+
+from world import Lane, build_lane
+
+
+class LaneGenerator:
+    def __init__(self, chunk_rows: int = 16):
+        self.chunk_rows = chunk_rows
+        self.ready: queue.SimpleQueue[tuple[int, list[Lane]]] = queue.SimpleQueue()
+        self._cond = threading.Condition()
+        self._seed: int | None = None
+        self._next = 0        # next row to build
+        self._target = -1     # build up to here
+        self._below: Lane | None = None
+        self._stop = False
+        self._thread = threading.Thread(target=self._run, name="lanegen", daemon=True)
+        self._thread.start()
+
+    def request(self, seed: int, next_gy: int, target_gy: int) -> None:
+        """Ask for rows [next_gy, target_gy] of world seed (earlier requests are superseded)."""
+        with self._cond:
+            new_world = seed != self._seed
+            if new_world or next_gy > self._next:
+                # New world, or the frame loop built past us: restart from next_gy.
+                self._seed, self._next, self._below = seed, next_gy, None
+            if new_world or target_gy > self._target:
+                self._target = target_gy
+            self._cond.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stop and self._next > self._target:
+                    self._cond.wait()
+                if self._stop:
+                    return
+                seed, start, below = self._seed, self._next, self._below
+                end = min(start + self.chunk_rows - 1, self._target)
+                self._next = end + 1
+
+            lanes = []
+            for gy in range(start, end + 1):
+                below = build_lane(seed, gy, None, below)   # validated against the row below
+                lanes.append(below)
+            self.ready.put((seed, lanes))
+
+            with self._cond:
+                if self._seed == seed and self._next == end + 1:
+                    self._below = below
+
+    def close(self) -> None:
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        self._thread.join(timeout=1.0)
@@ -0,0 +1,59 @@
+# lanetypes.py
+"""Lane-type registry: everything that depends on a lane's kind, in one table.
+
+A lane stores its integer kind and the LaneType resolved from it once, when the row
+is generated; the generator, the spawner, collisions and the renderer read fields of
+that record instead of comparing kind strings. A new lane type is one more entry
+here (plus a painter in render.LANE_PAINTERS).
+"""
+from __future__ import annotations
+from bisect import bisect_right
+from dataclasses import dataclass
+
+from movers import KIND_CAR, KIND_LOG, KIND_TRAIN, MAX_W_TILES
+from settings import LANE_COLORS
+
+# Lane kinds
+LANE_GRASS, LANE_ROAD, LANE_WATER, LANE_RAIL = range(4)
+
+# Collision rules
+COLLIDE_NONE = 0   # nothing moves here
+COLLIDE_HIT = 1    # touching a mover kills
+COLLIDE_RIDE = 2   # must stand on a mover, which carries you
+
+
+@dataclass(frozen=True)
+class LaneType:
+    kind: int
+    name: str
+    upto: float                          # raw kind draw r < upto picks this type (see THRESHOLDS)
+    color: tuple[int, int, int]
+    collision: int = COLLIDE_NONE
+    mover_kind: int | None = None        # KIND_* spawned here (and its difficulty.Tuning profile)
+    spawn_interval: tuple[float, float] = (1.0, 1.0)   # seconds at multiplier 1, drawn uniformly
+    speed: tuple[float, float] = (120.0, 120.0)        # px/s at multiplier 1, drawn uniformly
+    mover_w: tuple[int, int] = (1, 2)                  # width range in tiles
+    trees: tuple[int, int] | None = None               # tree count range (grass)
+
+
+# more roads/grass, occasional water, rare rail
+LANE_TYPES = (
+    LaneType(LANE_GRASS, "grass", 0.42, LANE_COLORS["grass"], trees=(2, 5)),
+    LaneType(LANE_ROAD, "road", 0.80, LANE_COLORS["road"], COLLIDE_HIT, KIND_CAR,
+             (0.7, 1.2), (140, 240), (1, 2)),
+    LaneType(LANE_WATER, "water", 0.95, LANE_COLORS["water"], COLLIDE_RIDE, KIND_LOG,
+             (0.8, 1.3), (90, 170), (2, 3)),
+    # Trains are rarer but wide and dangerous
+    LaneType(LANE_RAIL, "rail", 1.00, LANE_COLORS["rail"], COLLIDE_HIT, KIND_TRAIN,
+             (3.0, 5.0), (220, 320), (4, 6)),
+)
+THRESHOLDS = [t.upto for t in LANE_TYPES[:-1]]
+
+# The overlap bisections (MoverTable.first_overlap) only look MAX_W_TILES back
+if max(t.mover_w[1] for t in LANE_TYPES) > MAX_W_TILES:
+    raise ValueError(f"a LaneType.mover_w exceeds movers.MAX_W_TILES = {MAX_W_TILES}")
+
+
+def kind_from_draw(r: float) -> int:
+    """Lane kind for a uniform draw r in [0, 1)."""
+    return bisect_right(THRESHOLDS, r)
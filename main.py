@@ -1,105 +1,208 @@
 # main.py
 from __future__ import annotations
-import pygame
+import os
 import time
+LAUNCH_T = time.perf_counter()   # start of the time-to-first-frame measurement
+
+import pygame
 
 from settings import (
-    WIDTH, HEIGHT, FPS, TITLE, TILE, COLS,
-    COLOR_BG, MOVE_COOLDOWN, CAMERA_MARGIN_TILES,
+    WIDTH, HEIGHT, FPS, TITLE,
+    COLOR_BG, DIRTY_RECTS, TELEMETRY_JSONL, RECORD_DIR, SIM_DT,
+    WINDOW_SIZE, RENDER_SCALE, DYNAMIC_SCALE, RENDER_BUDGET_MS, BACKGROUND_GEN,
+    AUTOPILOT, AUTOPILOT_BUDGET_MS,
 )
-from entities import Player
-from world import World
-from ui import draw_hud, draw_game_over, init_fonts
+import difficulty
+from bot import Autopilot
+from input_queue import InputQueue
+from profiler import FrameProfiler
+from replay import Recording
+from sim import Simulation, FixedStep, NOOP, UP, DOWN, LEFT, RIGHT
+from render import draw_world, draw_player, DirtyRectPresenter, ScaledOutput
+from ui import draw_hud, draw_game_over, draw_paused, draw_debug_overlay
+
+KEY_ACTIONS = {
+    pygame.K_LEFT: LEFT,   pygame.K_a: LEFT,
+    pygame.K_RIGHT: RIGHT, pygame.K_d: RIGHT,
+    pygame.K_UP: UP,       pygame.K_w: UP,
+    pygame.K_DOWN: DOWN,   pygame.K_s: DOWN,
+}
+
+def save_recording(rec: Recording, sim: Simulation) -> None:
+    if RECORD_DIR is None or rec.saved:
+        return
+    rec.finish(sim)
+    os.makedirs(RECORD_DIR, exist_ok=True)
+    rec.save(os.path.join(RECORD_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{sim.seed}.crr"))
+    rec.saved = True
 
 def main():
-    pygame.init()
+    # Only what we use: no audio/joystick init. Fonts load on first use (see ui.py).
+    pygame.display.init()
     pygame.display.set_caption(TITLE)
-    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    window_size = tuple(WINDOW_SIZE or (WIDTH, HEIGHT))
+    screen = pygame.display.set_mode(window_size)
     clock = pygame.time.Clock()
-    init_fonts()
-
-    def new_game():
-        world = World()
-        player = Player(gx=COLS // 2, gy=2, alive=True, score=0)
-        camera_y_px = 0.0
-        best = 0
-        return world, player, camera_y_px, best
 
-    world, player, camera_y_px, best_score = new_game()
+    presenter = DirtyRectPresenter() if DIRTY_RECTS else None
+    # Offscreen canvas + one scale pass when the world isn't drawn 1:1 into the window
+    # (dirty-rect presentation works in window pixels, so it always draws 1:1).
+    scaled = None
+    if presenter is None and (window_size != (WIDTH, HEIGHT) or RENDER_SCALE != 1.0 or DYNAMIC_SCALE):
+        scaled = ScaledOutput(screen, RENDER_SCALE, DYNAMIC_SCALE, RENDER_BUDGET_MS)
+    prof = FrameProfiler(jsonl_path=TELEMETRY_JSONL)
+    show_overlay = False   # F3
+    overlay_lines: list[str] = []
+
+    sim = Simulation(background_gen=BACKGROUND_GEN)
+    rec = Recording(sim.seed)
+    stepper = FixedStep()
+    inputs = InputQueue()   # moves wait here for a tick the cooldown allows
+    bot = Autopilot(AUTOPILOT_BUDGET_MS)
+    autopilot = AUTOPILOT   # F2: the bot replaces the keyboard as the input source
+    best_score = 0
     paused = False
-    last_move_time = 0.0
     running = True
+    first_frame_ms: float | None = None   # launch -> first flip
+    restart_ms = 0.0                      # last R press -> new game ready
 
     while running:
         dt = clock.tick(FPS) / 1000.0
-        now = time.time()
+        prof.begin_frame()
+        player = sim.player
 
         for event in pygame.event.get():
             # Pause toggle
             if event.type == pygame.KEYDOWN and event.key == pygame.K_p and player.alive:
                 paused = not paused
-                
+
+            # Timing overlay toggle
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                show_overlay = not show_overlay
+
+            # Autopilot toggle
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F2:
+                autopilot = not autopilot
+                inputs.clear()
+
             if event.type == pygame.QUIT:
                 running = False
 
             # Restart (only when game over)
             if event.type == pygame.KEYDOWN and (not player.alive):
                 if event.key == pygame.K_r:
-                    world, player, camera_y_px, best_score = new_game()
+                    t_restart = time.perf_counter()
+                    sim.reset()   # reuses the world's lane pool and mover table
+                    rec = Recording(sim.seed)
+                    player = sim.player
+                    best_score = 0
                     paused = False
-                    last_move_time = 0.0
-
-            # Movement (discrete stepping)
-            if event.type == pygame.KEYDOWN and player.alive and (not paused):
-                if now - last_move_time >= MOVE_COOLDOWN:
-                    dx, dy = 0, 0
-                    if event.key in (pygame.K_LEFT, pygame.K_a):
-                        dx = -1
-                    elif event.key in (pygame.K_RIGHT, pygame.K_d):
-                        dx = 1
-                    elif event.key in (pygame.K_UP, pygame.K_w):
-                        dy = 1
-                    elif event.key in (pygame.K_DOWN, pygame.K_s):
-                        dy = -1
-
-                    if dx != 0 or dy != 0:
-                        ngX = player.gx + dx
-                        ngY = player.gy + dy
-                        if world.can_step_to(ngX, ngY):
-                            player.gx, player.gy = ngX, ngY
-                            last_move_time = now
-
-                            # scoring: max forward progress (gy)
-                            player.score = max(player.score, player.gy)
-                            best_score = max(best_score, player.score)
+                    stepper = FixedStep()
+                    inputs.clear()
+                    restart_ms = (time.perf_counter() - t_restart) * 1000.0
 
-        if player.alive and (not paused):
-            # Camera follows upward progress
-            target_camera = max(0.0, (player.gy - CAMERA_MARGIN_TILES) * TILE)
-            camera_y_px = max(camera_y_px, target_camera)
-
-            # Update world
-            world.update(dt, camera_y_px, player.score)
-
-            # Collision + water logic
-            world.check_collisions_and_water(player, dt)
+            # Movement (discrete stepping; queued until the simulation's cooldown allows it)
+            if event.type == pygame.KEYDOWN and player.alive and (not paused) and (not autopilot):
+                action = KEY_ACTIONS.get(event.key, NOOP)
+                if action != NOOP:
+                    inputs.push(action)
 
+        prof.mark("events")
 
-        # Draw
-        screen.fill(COLOR_BG)
-        world.draw(screen, camera_y_px)
-        player.draw(screen, camera_y_px)
-        draw_hud(screen, player.score, best_score)
+        if player.alive and (not paused):
+            # Fixed-rate ticks; each is sim.step(SIM_DT, action) split up for the profiler
+            if autopilot:
+                bot.begin_frame()   # one planning budget for all of this frame's ticks
+            for _ in range(stepper.advance(dt)):
+                sim.begin_tick(SIM_DT)
+                action = (bot if autopilot else inputs).next_action(sim)
+                rec.record(sim.ticks, action)
+                sim.try_move(action)
+                prof.mark("move")
+                sim.update_world(SIM_DT)
+                prof.mark("update")
+                sim.collide(SIM_DT)
+                prof.mark("collide")
+                if not player.alive:
+                    save_recording(rec, sim)
+                    break
+            best_score = max(best_score, player.score)
+
+        world = sim.world
+        telemetry = {
+            "movers": len(world.movers),
+            "lanes": max(0, world.view_max - world.view_min + 1),   # lanes with materialized traffic
+            "score": player.score,
+        }
+        if show_overlay and prof.frame_no % 15 == 0:
+            overlay_lines = prof.summary_lines() + [
+                f"movers {telemetry['movers']}  lanes {telemetry['lanes']}",
+                difficulty.debug_string(player.score),
+                bot.summary_line() if autopilot else inputs.summary_line(),
+                f"first frame {first_frame_ms or 0:.0f} ms  restart {restart_ms:.2f} ms",
+            ]
+            if scaled is not None:
+                overlay_lines.append(f"render scale {scaled.scale:g}  world draw {scaled.avg_ms:.2f} ms")
+
+        # Draw (movers interpolated between the last two ticks)
+        alpha = stepper.alpha
+        if presenter is not None:
+            frame_key = (sim.seed, sim.ticks, alpha, paused, player.alive, best_score,
+                         show_overlay and prof.frame_no // 15)
+            if not presenter.needs_redraw(frame_key):
+                prof.end_frame(**telemetry)
+                continue  # idle (paused / game over): nothing changed on screen
+
+        dirty = [] if presenter is not None else None
+        if scaled is not None:
+            t_draw = time.perf_counter()
+            canvas = scaled.canvas
+            canvas.fill(COLOR_BG)
+            draw_world(canvas, world, sim.camera_y_px, None, alpha, scaled.scale)
+            draw_player(canvas, player, sim.camera_y_px, scaled.scale)
+            draw_ms = (time.perf_counter() - t_draw) * 1000.0
+            ui_screen = scaled.present()   # HUD goes on top at window resolution
+            scaled.update(draw_ms)
+            telemetry["scale"] = scaled.scale
+        else:
+            ui_screen = screen
+            screen.fill(COLOR_BG)
+            draw_world(screen, world, sim.camera_y_px, dirty, alpha)
+            player_rect = draw_player(screen, player, sim.camera_y_px)
+        prof.mark("draw")
+        hud_rect = draw_hud(ui_screen, player.score, best_score)
 
         if paused and player.alive:
-            from ui import draw_paused
-            draw_paused(screen)
-
+            draw_paused(ui_screen)
 
         if not player.alive:
-            draw_game_over(screen, player.score)
-
-        pygame.display.flip()
+            draw_game_over(ui_screen, player.score)
+
+        if show_overlay and overlay_lines:
+            overlay_rect = draw_debug_overlay(ui_screen, overlay_lines)
+            if dirty is not None:
+                dirty.append(overlay_rect)
+        prof.mark("hud")
+
+        if presenter is not None:
+            dirty.append(player_rect)
+            dirty.append(hud_rect)
+            layout_key = (sim.seed, sim.camera_y_px, paused, player.alive, show_overlay)
+            presenter.present(frame_key, layout_key, dirty)
+        else:
+            pygame.display.flip()
+        prof.mark("flip")
+        latency = inputs.flipped()
+        if latency is not None:
+            telemetry["input_ms"] = round(latency * 1000.0, 2)
+        if first_frame_ms is None:
+            first_frame_ms = (time.perf_counter() - LAUNCH_T) * 1000.0
+            telemetry["first_frame_ms"] = round(first_frame_ms, 2)
+        prof.end_frame(**telemetry)
+
+    save_recording(rec, sim)
+    sim.world.close()
+    prof.close()
 
     pygame.quit()
 
@@ -0,0 +1,233 @@
+# movers.py
+"""World-wide struct-of-arrays storage for cars, logs and trains.
+
+One row per mover in the lanes around the camera. A mover's position is a
+closed-form function of its kind's phase clock, x = x0 + dir * base * (phase - t0),
+so the table is a view the world materializes for visible lanes and re-evaluates
+with a handful of NumPy operations, instead of integrating per-lane object lists.
+"""
+from __future__ import annotations
+import numpy as np
+
+from settings import TILE, WIDTH
+
+# Mover kinds (index into the per-kind speed multiplier array)
+KIND_CAR, KIND_LOG, KIND_TRAIN = 0, 1, 2
+N_KINDS = 3
+
+CAR_PALETTE = [
+    (230, 80, 80),   (80, 160, 230), (240, 200, 70),
+    (120, 210, 120), (200, 120, 230), (235, 235, 235),
+    (40, 40, 45),    (210, 140, 70)
+]
+
+# Movers this far outside the screen are dropped
+CULL_MARGIN_PX = TILE * 8
+
+MAX_W_TILES = 6  # widest mover (trains); bounds the bisection window in first_overlap
+
+_LANE_KEY = 1 << 20  # lane stride of the combined (gy, x) sort key in first_overlaps
+
+
+def is_culled(left, right):
+    """Whether a mover spanning [left, right) px is far enough off screen to drop."""
+    return (right < -CULL_MARGIN_PX) | (left > WIDTH + CULL_MARGIN_PX)
+
+
+class MoverTable:
+    COLUMNS = (
+        ("x", np.float64),           # left edge, world px
+        ("prev_x", np.float64),      # x before the last tick (for render interpolation)
+        ("x0", np.float64),          # x at spawn
+        ("t0", np.float64),          # kind phase at spawn
+        ("gy", np.int64),            # lane row
+        ("w", np.int64),             # width in tiles
+        ("base_speed", np.float64),  # lane base speed, px/s
+        ("speed", np.float64),       # current speed (base * difficulty mult)
+        ("direction", np.int8),      # +1 right, -1 left
+        ("kind", np.int8),           # KIND_*
+        ("color", np.int8),          # CAR_PALETTE index (cars only)
+    )
+
+    def __init__(self, capacity: int = 256):
+        self.n = 0
+        self.capacity = capacity
+        # Rows sorted by (gy, x)? Movers in a lane share one velocity, so moving never
+        # reorders them; only spawns (appended at the end) do.
+        self.sorted = True
+        for name, dtype in self.COLUMNS:
+            setattr(self, "_" + name, np.zeros(capacity, dtype=dtype))
+
+    # Live views (first n rows)
+    @property
+    def x(self) -> np.ndarray: return self._x[:self.n]
+    @property
+    def prev_x(self) -> np.ndarray: return self._prev_x[:self.n]
+    @property
+    def x0(self) -> np.ndarray: return self._x0[:self.n]
+    @property
+    def t0(self) -> np.ndarray: return self._t0[:self.n]
+    @property
+    def gy(self) -> np.ndarray: return self._gy[:self.n]
+    @property
+    def w(self) -> np.ndarray: return self._w[:self.n]
+    @property
+    def base_speed(self) -> np.ndarray: return self._base_speed[:self.n]
+    @property
+    def speed(self) -> np.ndarray: return self._speed[:self.n]
+    @property
+    def direction(self) -> np.ndarray: return self._direction[:self.n]
+    @property
+    def kind(self) -> np.ndarray: return self._kind[:self.n]
+    @property
+    def color(self) -> np.ndarray: return self._color[:self.n]
+
+    def __len__(self) -> int:
+        return self.n
+
+    def clear(self) -> None:
+        self.n = 0
+        self.sorted = True
+
+    def _grow(self) -> None:
+        self.capacity *= 2
+        for name, _ in self.COLUMNS:
+            old = getattr(self, "_" + name)
+            new = np.zeros(self.capacity, dtype=old.dtype)
+            new[:self.n] = old[:self.n]
+            setattr(self, "_" + name, new)
+
+    def add(self, x: float, gy: int, w: int, base_speed: float, speed: float,
+            direction: int, kind: int, color: int = 0, x0: float | None = None, t0: float = 0.0) -> None:
+        if self.n == self.capacity:
+            self._grow()
+        i = self.n
+        self._x[i] = x
+        self._prev_x[i] = x
+        self._x0[i] = x if x0 is None else x0
+        self._t0[i] = t0
+        self._gy[i] = gy
+        self._w[i] = w
+        self._base_speed[i] = base_speed
+        self._speed[i] = speed
+        self._direction[i] = direction
+        self._kind[i] = kind
+        self._color[i] = color
+        self.n += 1
+        self.sorted = False
+
+    def pack(self) -> bytes:
+        """The live rows, column after column (see COLUMNS), as raw bytes."""
+        return b"".join(getattr(self, "_" + name)[:self.n].tobytes() for name, _ in self.COLUMNS)
+
+    def unpack(self, n: int, data, sorted_: bool = True) -> int:
+        """Replace the contents with n rows from pack() output; returns bytes consumed."""
+        while self.capacity < n:
+            self._grow()
+        off = 0
+        for name, dtype in self.COLUMNS:
+            size = n * np.dtype(dtype).itemsize
+            getattr(self, "_" + name)[:n] = np.frombuffer(data, dtype=dtype, count=n, offset=off)
+            off += size
+        self.n = n
+        self.sorted = sorted_
+        return off
+
+    def ensure_sorted(self) -> None:
+        if self.sorted:
+            return
+        order = np.lexsort((self.x, self.gy))
+        for name, _ in self.COLUMNS:
+            arr = getattr(self, "_" + name)
+            arr[:self.n] = arr[:self.n][order]
+        self.sorted = True
+
+    def lane_bounds(self, gy: int) -> tuple[int, int]:
+        """[lo, hi) row range of lane gy, movers ordered left to right. O(log n)."""
+        self.ensure_sorted()
+        g = self.gy
+        return int(np.searchsorted(g, gy, "left")), int(np.searchsorted(g, gy, "right"))
+
+    def first_overlap(self, gy: int, a: int, b: int) -> int:
+        """First row in lane gy whose [int(x), int(x) + w*TILE) overlaps [a, b), or -1.
+
+        Left edges are sorted, and no mover is wider than MAX_W_TILES, so only the rows
+        with x in (a - MAX_W_TILES*TILE, b) can hit; two bisections find them.
+        """
+        lo, hi = self.lane_bounds(gy)
+        if lo == hi:
+            return -1
+        xs = self._x[lo:hi]
+        # +-1 px: int() truncates toward zero
+        j0 = lo + int(np.searchsorted(xs, a - MAX_W_TILES * TILE - 1, "right"))
+        j1 = lo + int(np.searchsorted(xs, b + 1, "left"))
+        x, w = self._x, self._w
+        for j in range(j0, j1):
+            left = int(x[j])
+            if left < b and a < left + int(w[j]) * TILE:
+                return j
+        return -1
+
+    def first_overlaps(self, gy: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """first_overlap for many queries at once: per query, the first row in lane gy[i]
+        overlapping [a[i], b[i]), or -1.
+
+        The same two bisections, on a combined (gy, x) key, find each query's few
+        candidate rows; the candidates are then tested together.
+        """
+        self.ensure_sorted()
+        out = np.full(len(gy), -1, dtype=np.int64)
+        if self.n == 0 or len(gy) == 0:
+            return out
+        # Lanes are _LANE_KEY px apart on the key, far more than any x in the table
+        keys = self.gy * _LANE_KEY + self.x
+        base = gy * _LANE_KEY
+        j0 = np.searchsorted(keys, base + (a - MAX_W_TILES * TILE - 1), "right")
+        j1 = np.searchsorted(keys, base + (b + 1), "left")
+        width = int((j1 - j0).max(initial=0))
+        if width <= 0:
+            return out
+        j = j0[:, None] + np.arange(width)
+        valid = j < j1[:, None]
+        j = np.where(valid, j, 0)
+        left = self.x[j].astype(np.int64)
+        hit = valid & (left < b[:, None]) & (a[:, None] < left + self.w[j] * TILE)
+        first = hit.argmax(axis=1)
+        found = hit[np.arange(len(gy)), first]
+        out[found] = j[found, first[found]]
+        return out
+
+    def advance(self, phase: np.ndarray, kind_mult: np.ndarray, min_gy: int, max_gy: int,
+                extra_gy: list[int] | None = None) -> None:
+        """Re-evaluate every mover at the per-kind phase clocks, dropping rows whose lane
+        is outside [min_gy, max_gy] (and not in extra_gy) and rows that left the screen."""
+        if self.n == 0:
+            return
+        gy = self.gy
+        keep = (gy >= min_gy) & (gy <= max_gy)
+        if extra_gy:
+            keep |= np.isin(gy, extra_gy)
+
+        kind = self.kind
+        np.multiply(self.base_speed, kind_mult[kind], out=self.speed)
+        x = self.x
+        np.copyto(self.prev_x, x)
+        np.copyto(x, self.x0 + self.direction * self.base_speed * (phase[kind] - self.t0))
+
+        left = x.astype(np.int64)
+        keep &= ~is_culled(left, left + self.w * TILE)
+        if not keep.all():
+            self.compact(keep)
+
+    def lerp_x(self, rows: np.ndarray, alpha: float) -> np.ndarray:
+        """Positions of rows a fraction alpha of the way through the current tick."""
+        prev = self._prev_x[rows]
+        return prev + (self._x[rows] - prev) * alpha
+
+    def compact(self, keep: np.ndarray) -> None:
+        """Drop rows where keep is False, preserving order."""
+        m = int(np.count_nonzero(keep))
+        for name, _ in self.COLUMNS:
+            arr = getattr(self, "_" + name)
+            arr[:m] = arr[:self.n][keep]
+        self.n = m
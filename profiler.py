@@ -0,0 +1,67 @@
+# profiler.py
+"""Per-phase frame timing for the main loop, with rolling percentiles and JSONL export."""
+from __future__ import annotations
+from collections import deque
+import json
+import time
+
+import numpy as np
+
+PHASES = ("events", "move", "update", "collide", "draw", "hud", "flip")
+
+
+class FrameProfiler:
+    def __init__(self, window: int = 240, jsonl_path: str | None = None):
+        self.window = window
+        self.history = {p: deque(maxlen=window) for p in PHASES}
+        self.history["frame"] = deque(maxlen=window)
+        self.frame_no = 0
+        self.current: dict[str, float] = {}
+        self._t_frame = 0.0
+        self._t_last = 0.0
+        self._jsonl = open(jsonl_path, "a", buffering=1 << 16) if jsonl_path else None
+
+    def begin_frame(self) -> None:
+        self._t_frame = self._t_last = time.perf_counter()
+        self.current = dict.fromkeys(PHASES, 0.0)
+
+    def mark(self, phase: str) -> None:
+        """Charge the time since the previous mark (or begin_frame) to phase."""
+        now = time.perf_counter()
+        self.current[phase] += now - self._t_last
+        self._t_last = now
+
+    def end_frame(self, **extra) -> None:
+        frame_s = time.perf_counter() - self._t_frame
+        for p, v in self.current.items():
+            self.history[p].append(v)
+        self.history["frame"].append(frame_s)
+        self.frame_no += 1
+
+        if self._jsonl is not None:
+            rec = {"frame": self.frame_no, "t": round(self._t_frame, 6),
+                   "frame_ms": round(frame_s * 1000.0, 4)}
+            for p, v in self.current.items():
+                rec[p + "_ms"] = round(v * 1000.0, 4)
+            rec.update(extra)
+            self._jsonl.write(json.dumps(rec) + "\n")
+
+    def percentiles(self) -> dict[str, tuple[float, float, float]]:
+        """Rolling (p50, p95, p99) in milliseconds per phase."""
+        out = {}
+        for p, samples in self.history.items():
+            if samples:
+                p50, p95, p99 = np.percentile(np.fromiter(samples, dtype=np.float64), (50, 95, 99))
+                out[p] = (p50 * 1000.0, p95 * 1000.0, p99 * 1000.0)
+        return out
+
+    def summary_lines(self) -> list[str]:
+        lines = [f"{'phase':8s} {'p50':>6s} {'p95':>6s} {'p99':>6s} ms"]
+        for p, (p50, p95, p99) in self.percentiles().items():
+            lines.append(f"{p:8s} {p50:6.2f} {p95:6.2f} {p99:6.2f}")
+        return lines
+
+    def close(self) -> None:
+        if self._jsonl is not None:
+            self._jsonl.close()
+            self._jsonl = None
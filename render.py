@@ -0,0 +1,586 @@
+# render.py
+from __future__ import annotations
+import numpy as np
+import pygame
+
+from settings import (
+    TILE, WIDTH, HEIGHT, ROWS,
+    COLOR_TREE,
+)
+from entities import Player
+from lanetypes import LANE_GRASS, LANE_ROAD, LANE_WATER, LANE_RAIL
+from utils import iter_bits
+from movers import MoverTable, KIND_CAR, KIND_LOG, KIND_TRAIN, CAR_PALETTE
+
+
+def _screen_y(screen: pygame.Surface, gy: int, camera_y_px: float) -> int:
+    y = gy * TILE
+    return screen.get_height() - (y - camera_y_px) - TILE
+
+
+# =====================
+# Player (the chick)
+# =====================
+def draw_player(screen: pygame.Surface, player: Player, camera_y_px: float,
+                scale: float = 1.0) -> pygame.Rect:
+    if scale != 1.0:
+        x = int(player.gx * TILE * scale)
+        sy = int((round(screen.get_height() / scale) - (player.gy * TILE - camera_y_px) - TILE) * scale)
+        pad = round(SPRITE_PAD * scale)
+        return screen.blit(SPRITES.player(scale), (x - pad, sy - pad))
+    x = player.gx * TILE
+    sy = _screen_y(screen, player.gy, camera_y_px)
+    return screen.blit(SPRITES.player(), (x - SPRITE_PAD, sy - SPRITE_PAD))
+
+def draw_crowd(screen: pygame.Surface, gx: np.ndarray, gy: np.ndarray, camera_y_px: float) -> None:
+    """Ghost chicks at the given cells, one batched blit."""
+    xs = (gx * TILE - SPRITE_PAD).tolist()
+    sys_ = (screen.get_height() - (gy * TILE - camera_y_px) - TILE - SPRITE_PAD).astype(np.int64).tolist()
+    ghost = SPRITES.ghost()
+    blit_batch(screen, [(ghost, (x, sy)) for x, sy in zip(xs, sys_)])
+
+def paint_player(screen: pygame.Surface, x: int, sy: int) -> None:
+    cx = x + TILE // 2
+    cy = sy + TILE // 2
+
+    # Body
+    body = pygame.Rect(0, 0, int(TILE * 0.78), int(TILE * 0.68))
+    body.center = (cx, cy + 2)
+    pygame.draw.ellipse(screen, (250, 225, 110), body)
+
+    # Head
+    head_r = int(TILE * 0.22)
+    head_center = (cx + int(TILE * 0.18), cy - int(TILE * 0.12))
+    pygame.draw.circle(screen, (255, 235, 140), head_center, head_r)
+
+    # Beak
+    beak = [
+        (head_center[0] + head_r - 1, head_center[1]),
+        (head_center[0] + head_r + int(TILE * 0.16), head_center[1] - int(TILE * 0.06)),
+        (head_center[0] + head_r + int(TILE * 0.16), head_center[1] + int(TILE * 0.06)),
+    ]
+    pygame.draw.polygon(screen, (245, 150, 60), beak)
+
+    # Eye
+    pygame.draw.circle(
+        screen,
+        (30, 30, 30),
+        (head_center[0] + int(TILE * 0.06), head_center[1] - int(TILE * 0.04)),
+        max(2, TILE // 18),
+    )
+
+    # Wing
+    wing = pygame.Rect(0, 0, int(TILE * 0.34), int(TILE * 0.22))
+    wing.center = (cx - int(TILE * 0.10), cy + int(TILE * 0.05))
+    pygame.draw.ellipse(screen, (240, 205, 95), wing)
+
+    # Feet
+    foot_y = sy + int(TILE * 0.80)
+    pygame.draw.line(
+        screen, (200, 120, 40),
+        (cx - int(TILE * 0.12), foot_y),
+        (cx - int(TILE * 0.12), foot_y + int(TILE * 0.12)), 3
+    )
+    pygame.draw.line(
+        screen, (200, 120, 40),
+        (cx + int(TILE * 0.02), foot_y),
+        (cx + int(TILE * 0.02), foot_y + int(TILE * 0.12)), 3
+    )
+
+
+# =====================
+# Car (sedan or bus)
+# =====================
+def draw_car(screen: pygame.Surface, x: int, sy: int, w_tiles: int,
+             color: tuple[int, int, int], direction: int) -> None:
+    w = w_tiles * TILE
+    h = TILE
+
+    if w_tiles == 1:
+        _draw_sedan(screen, x, sy, w, h, color, direction)
+    else:
+        _draw_bus(screen, x, sy, w, h, color, direction)
+
+def _draw_sedan(screen: pygame.Surface, x: int, y: int, w: int, h: int,
+                color: tuple[int, int, int], direction: int) -> None:
+    body = pygame.Rect(x + 2, y + h//3, w - 4, h - h//3 - 2)
+    pygame.draw.rect(screen, color, body, border_radius=7)
+
+    roof = pygame.Rect(x + w//6, y + h//5, w - 2*(w//6), h//3)
+    pygame.draw.rect(screen, tuple(max(0, c - 25) for c in color), roof, border_radius=7)
+
+    win = pygame.Rect(roof.x + 3, roof.y + 3, roof.w - 6, roof.h - 6)
+    pygame.draw.rect(screen, (190, 220, 255), win, border_radius=6)
+
+    wheel_r = max(3, h // 7)
+    pygame.draw.circle(screen, (25, 25, 28), (x + w//4, y + h - 4), wheel_r)
+    pygame.draw.circle(screen, (25, 25, 28), (x + 3*w//4, y + h - 4), wheel_r)
+
+    if direction == 1:
+        pygame.draw.rect(screen, (255, 235, 170), (x + w - 6, y + h//2, 4, 5), border_radius=2)
+    else:
+        pygame.draw.rect(screen, (255, 90, 90), (x + 2, y + h//2, 4, 5), border_radius=2)
+
+def _draw_bus(screen: pygame.Surface, x: int, y: int, w: int, h: int,
+              color: tuple[int, int, int], direction: int) -> None:
+    body = pygame.Rect(x + 2, y + h//5, w - 4, h - h//5 - 2)
+    pygame.draw.rect(screen, color, body, border_radius=6)
+
+    stripe = pygame.Rect(body.x + 2, body.y + body.h//2, body.w - 4, 4)
+    pygame.draw.rect(screen, tuple(max(0, c - 35) for c in color), stripe, border_radius=2)
+
+    n = 3 if w <= 2*TILE else 4
+    pad = 4
+    win_w = (body.w - (n+1)*pad) // n
+    win_h = body.h // 3
+    wy = body.y + pad
+    for i in range(n):
+        wx = body.x + pad + i*(win_w + pad)
+        pygame.draw.rect(screen, (190, 220, 255), (wx, wy, win_w, win_h), border_radius=4)
+
+    wheel_r = max(3, h // 7)
+    wheel_y = y + h - 4
+    pygame.draw.circle(screen, (25, 25, 28), (x + w//5, wheel_y), wheel_r)
+    pygame.draw.circle(screen, (25, 25, 28), (x + w//2, wheel_y), wheel_r)
+    pygame.draw.circle(screen, (25, 25, 28), (x + 4*w//5, wheel_y), wheel_r)
+
+    door = pygame.Rect(body.x + body.w//10, body.y + body.h//3, body.w//8, body.h//2)
+    pygame.draw.rect(screen, tuple(max(0, c - 45) for c in color), door, border_radius=4)
+
+    if direction == 1:
+        pygame.draw.rect(screen, (255, 235, 170), (x + w - 6, y + h//2, 4, 7), border_radius=2)
+    else:
+        pygame.draw.rect(screen, (255, 90, 90), (x + 2, y + h//2, 4, 7), border_radius=2)
+
+
+# =====================
+# Log (wood plank)
+# =====================
+def draw_log(screen: pygame.Surface, x: int, sy: int, w_tiles: int) -> None:
+    w = w_tiles * TILE
+    h = TILE
+
+    base = pygame.Rect(x + 1, sy + h//3, w - 2, h - h//3 - 2)
+    pygame.draw.rect(screen, (150, 110, 60), base, border_radius=8)
+
+    pygame.draw.rect(screen, (175, 130, 75),
+                     pygame.Rect(base.x, base.y, base.w, 4), border_radius=6)
+    pygame.draw.rect(screen, (120, 85, 45),
+                     pygame.Rect(base.x, base.bottom - 4, base.w, 4), border_radius=6)
+
+    for i in range(4):
+        yy = base.y + 6 + i * (base.h - 12) // 3
+        pygame.draw.line(screen, (130, 95, 55), (base.x + 6, yy), (base.right - 6, yy), 2)
+
+    if base.w > TILE:
+        kx1 = base.x + base.w // 3
+        kx2 = base.x + 2 * base.w // 3
+        ky = base.y + base.h // 2
+        pygame.draw.circle(screen, (125, 90, 50), (kx1, ky), 6, 2)
+        pygame.draw.circle(screen, (125, 90, 50), (kx2, ky), 6, 2)
+
+    pygame.draw.circle(screen, (125, 90, 50), (base.left + 10, base.centery), 10, 2)
+    pygame.draw.circle(screen, (125, 90, 50), (base.right - 10, base.centery), 10, 2)
+
+
+# =====================
+# Train
+# =====================
+def draw_train(screen: pygame.Surface, x: int, sy: int, w_tiles: int, direction: int) -> None:
+    w = w_tiles * TILE
+    h = TILE
+
+    body = pygame.Rect(x + 1, sy + h//4, w - 2, h - h//4 - 2)
+    pygame.draw.rect(screen, (210, 210, 215), body, border_radius=6)
+
+    pygame.draw.rect(screen, (180, 40, 40), (body.x, body.y + 4, body.w, 5), border_radius=3)
+
+    pad = 6
+    win_h = body.h // 2
+    win_y = body.y + body.h//2 - win_h//2
+    n = max(2, min(6, body.w // (TILE//2)))
+    win_w = max(10, (body.w - (n+1)*pad) // n)
+    for i in range(n):
+        wx = body.x + pad + i*(win_w + pad)
+        pygame.draw.rect(screen, (190, 220, 255), (wx, win_y, win_w, win_h), border_radius=4)
+
+    wheel_r = max(3, h // 8)
+    wheel_y = sy + h - 4
+    wheel_count = max(3, body.w // (TILE//2))
+    for i in range(wheel_count):
+        wx = x + 8 + i * (w - 16) // (wheel_count - 1)
+        pygame.draw.circle(screen, (30, 30, 35), (wx, wheel_y), wheel_r)
+
+    if direction == 1:
+        cab = pygame.Rect(body.right - TILE//2, body.y - 2, TILE//2 - 2, body.h + 4)
+        pygame.draw.rect(screen, (200, 200, 205), cab, border_radius=5)
+        pygame.draw.circle(screen, (255, 245, 200), (body.right - 4, body.centery), 5)
+    else:
+        cab = pygame.Rect(body.x + 2, body.y - 2, TILE//2 - 2, body.h + 4)
+        pygame.draw.rect(screen, (200, 200, 205), cab, border_radius=5)
+        pygame.draw.circle(screen, (255, 245, 200), (body.x + 4, body.centery), 5)
+
+
+# =====================
+# Sprite cache + batched blits
+# =====================
+SPRITE_PAD = 8  # transparent border; the chick's beak pokes out of its tile
+GHOST_ALPHA = 110
+
+def _new_sprite(w: int, h: int) -> pygame.Surface:
+    surf = pygame.Surface((w + 2 * SPRITE_PAD, h + 2 * SPRITE_PAD), pygame.SRCALPHA)
+    if pygame.display.get_surface() is not None:
+        surf = surf.convert_alpha()
+    return surf
+
+def _scaled(surf: pygame.Surface, scale: float) -> pygame.Surface:
+    w, h = surf.get_size()
+    return pygame.transform.smoothscale(surf, (round(w * scale), round(h * scale)))
+
+class SpriteCache:
+    """Each (kind, w_tiles, color, direction) variant is drawn once and reused every frame.
+
+    Other render scales are resampled once from the scale-1 sprite and cached alongside.
+    """
+
+    def __init__(self):
+        self.sprites: dict[tuple, pygame.Surface] = {}
+
+    def clear(self) -> None:
+        self.sprites.clear()
+
+    def mover(self, kind: int, w_tiles: int, color: int, direction: int,
+              scale: float = 1.0) -> pygame.Surface:
+        # Logs look the same both ways and only cars have a colour.
+        if kind != KIND_CAR:
+            color = 0
+        if kind == KIND_LOG:
+            direction = 1
+        if scale != 1.0:
+            key = (kind, w_tiles, color, direction, scale)
+            surf = self.sprites.get(key)
+            if surf is None:
+                surf = self.sprites[key] = _scaled(self.mover(kind, w_tiles, color, direction), scale)
+            return surf
+        key = (kind, w_tiles, color, direction)
+        surf = self.sprites.get(key)
+        if surf is None:
+            surf = _new_sprite(w_tiles * TILE, TILE)
+            p = SPRITE_PAD
+            if kind == KIND_CAR:
+                draw_car(surf, p, p, w_tiles, CAR_PALETTE[color], direction)
+            elif kind == KIND_LOG:
+                draw_log(surf, p, p, w_tiles)
+            elif kind == KIND_TRAIN:
+                draw_train(surf, p, p, w_tiles, direction)
+            self.sprites[key] = surf
+        return surf
+
+    def player(self, scale: float = 1.0) -> pygame.Surface:
+        if scale != 1.0:
+            surf = self.sprites.get(("player", scale))
+            if surf is None:
+                surf = self.sprites[("player", scale)] = _scaled(self.player(), scale)
+            return surf
+        surf = self.sprites.get("player")
+        if surf is None:
+            surf = _new_sprite(TILE, TILE)
+            paint_player(surf, SPRITE_PAD, SPRITE_PAD)
+            self.sprites["player"] = surf
+        return surf
+
+    def ghost(self) -> pygame.Surface:
+        """The player sprite, translucent (crowd agents)."""
+        surf = self.sprites.get("ghost")
+        if surf is None:
+            surf = self.player().copy()
+            surf.fill((255, 255, 255, GHOST_ALPHA), special_flags=pygame.BLEND_RGBA_MULT)
+            self.sprites["ghost"] = surf
+        return surf
+
+SPRITES = SpriteCache()
+
+def blit_batch(screen: pygame.Surface, seq: list) -> None:
+    """One call for many (surface, pos) pairs; fblits where available (pygame-ce)."""
+    fblits = getattr(screen, "fblits", None)
+    if fblits is not None:
+        fblits(seq)
+    else:
+        screen.blits(seq, False)
+
+def draw_movers(screen: pygame.Surface, movers: MoverTable, camera_y_px: float,
+                min_gy: int, max_gy: int, dirty: list | None = None, alpha: float = 1.0,
+                scale: float = 1.0) -> None:
+    """Blit every mover in [min_gy, max_gy]; append their screen rects to dirty if given.
+
+    alpha in [0, 1] interpolates between the previous and current simulation tick;
+    scale maps world pixels to screen pixels (see ScaledOutput).
+    """
+    gy = movers.gy
+    rows = np.flatnonzero((gy >= min_gy) & (gy <= max_gy))
+    if rows.size == 0:
+        return
+    x = movers.x[rows] if alpha >= 1.0 else movers.lerp_x(rows, alpha)
+    if scale != 1.0:
+        h = round(screen.get_height() / scale)
+        pad = round(SPRITE_PAD * scale)
+        xs = ((x * scale).astype(np.int64) - pad).tolist()
+        sys_ = (((h - (gy[rows] * TILE - camera_y_px) - TILE) * scale).astype(np.int64) - pad).tolist()
+        sprite = SPRITES.mover
+        blit_batch(screen, [
+            (sprite(k, w, c, d, scale), (x, sy))
+            for x, sy, w, d, k, c in zip(xs, sys_, movers.w[rows].tolist(), movers.direction[rows].tolist(),
+                                         movers.kind[rows].tolist(), movers.color[rows].tolist())
+        ])
+        return
+    xs = (x.astype(np.int64) - SPRITE_PAD).tolist()
+    h = screen.get_height()
+    sys_ = (h - (gy[rows] * TILE - camera_y_px) - TILE - SPRITE_PAD).astype(np.int64).tolist()
+    ws = movers.w[rows].tolist()
+    dirs = movers.direction[rows].tolist()
+    kinds = movers.kind[rows].tolist()
+    colors = movers.color[rows].tolist()
+
+    sprite = SPRITES.mover
+    blit_batch(screen, [
+        (sprite(k, w, c, d), (x, sy))
+        for x, sy, w, d, k, c in zip(xs, sys_, ws, dirs, kinds, colors)
+    ])
+    if dirty is not None:
+        hpad = TILE + 2 * SPRITE_PAD
+        dirty.extend(pygame.Rect(x, sy, w * TILE + 2 * SPRITE_PAD, hpad) for x, sy, w in zip(xs, sys_, ws))
+
+
+# =====================
+# Lanes / world
+# =====================
+def draw_lane(screen: pygame.Surface, lane, camera_y_px: float) -> None:
+    """Uncached lane background; draw_world goes through LANE_BG instead."""
+    y = lane.gy * TILE
+    paint_lane(screen, lane, HEIGHT - (y - camera_y_px) - TILE)
+
+def _paint_grass(screen: pygame.Surface, lane, screen_y: int) -> None:
+    # dots/flowers
+    for i in range(0, WIDTH, TILE // 2):
+        pygame.draw.circle(screen, (70, 165, 80), (i + (lane.gy * 7) % (TILE//2), screen_y + TILE//3), 2)
+        pygame.draw.circle(screen, (55, 125, 65), (i + (lane.gy * 11) % (TILE//2), screen_y + 2*TILE//3), 2)
+
+    # Trees
+    for gx in iter_bits(lane.blocked_mask):
+        tx = gx * TILE
+        trunk = pygame.Rect(tx + TILE//2 - 4, screen_y + TILE//2, 8, TILE//2 - 4)
+        pygame.draw.rect(screen, (95, 70, 40), trunk, border_radius=3)
+        pygame.draw.circle(screen, COLOR_TREE, (tx + TILE//2, screen_y + TILE//2), TILE//3)
+        pygame.draw.circle(screen, (25, 75, 30), (tx + TILE//2 - 6, screen_y + TILE//2 + 2), TILE//4)
+
+def _paint_road(screen: pygame.Surface, lane, screen_y: int) -> None:
+    # dashed center line
+    dash_w = TILE // 2
+    for x in range(0, WIDTH, dash_w * 2):
+        pygame.draw.rect(screen, (220, 220, 220), (x + dash_w//2, screen_y + TILE//2 - 2, dash_w, 4))
+
+    # subtle curb
+    pygame.draw.line(screen, (30, 30, 35), (0, screen_y), (WIDTH, screen_y), 2)
+
+def _paint_water(screen: pygame.Surface, lane, screen_y: int) -> None:
+    # waves
+    for x in range(0, WIDTH, TILE//2):
+        pygame.draw.arc(
+            screen, (200, 230, 255),
+            pygame.Rect(x, screen_y + TILE//3, TILE//2, TILE//2),
+            0, 3.14159, 2
+        )
+
+def _paint_rail(screen: pygame.Surface, lane, screen_y: int) -> None:
+    # sleepers
+    for x in range(0, WIDTH, TILE//2):
+        pygame.draw.rect(screen, (110, 85, 60), (x, screen_y + TILE//2 - 3, TILE//3, 6))
+    # rails
+    pygame.draw.line(screen, (190, 190, 190), (0, screen_y + TILE//3), (WIDTH, screen_y + TILE//3), 3)
+    pygame.draw.line(screen, (190, 190, 190), (0, screen_y + 2*TILE//3), (WIDTH, screen_y + 2*TILE//3), 3)
+
+# Texture / details per lane kind, drawn over the base color
+LANE_PAINTERS = {
+    LANE_GRASS: _paint_grass,
+    LANE_ROAD: _paint_road,
+    LANE_WATER: _paint_water,
+    LANE_RAIL: _paint_rail,
+}
+
+def paint_lane(screen: pygame.Surface, lane, screen_y: int) -> None:
+    # Base
+    pygame.draw.rect(screen, lane.ltype.color, (0, screen_y, WIDTH, TILE))
+    LANE_PAINTERS[lane.kind](screen, lane, screen_y)
+
+
+class LaneBackgroundCache:
+    """Static lane art (base, texture, trees) rendered once per row.
+
+    Rows are a pure function of (world seed, gy), so a surface stays valid until its
+    row scrolls out below the camera or a different world is drawn.
+    """
+
+    def __init__(self):
+        self.surfaces: dict[int, pygame.Surface] = {}
+        self.free: list[pygame.Surface] = []   # dropped rows' surfaces, repainted for new rows
+        self.seed: int | None = None
+        self.scale = 1.0
+        self.lowest_gy = 0
+
+    def clear(self) -> None:
+        self.free.extend(self.surfaces.values())
+        self.surfaces.clear()
+        self.lowest_gy = 0
+
+    def get(self, lane) -> pygame.Surface:
+        surf = self.surfaces.get(lane.gy)
+        if surf is None:
+            if self.free:
+                surf = self.free.pop()
+            else:
+                surf = pygame.Surface((round(WIDTH * self.scale), round(TILE * self.scale)))
+                if pygame.display.get_surface() is not None:
+                    surf = surf.convert()
+            if self.scale == 1.0:
+                paint_lane(surf, lane, 0)
+            else:
+                art = pygame.Surface((WIDTH, TILE))
+                paint_lane(art, lane, 0)
+                pygame.transform.smoothscale(art, surf.get_size(), surf)
+            self.surfaces[lane.gy] = surf
+        return surf
+
+    def sync(self, world, min_gy: int, scale: float = 1.0) -> None:
+        """Drop rows below min_gy; start over when the world or the render scale changes."""
+        if scale != self.scale:
+            self.clear()
+            self.free.clear()   # wrong size now
+            self.scale = scale
+        if world.seed != self.seed:
+            self.clear()
+            self.seed = world.seed
+        for gy in range(self.lowest_gy, min_gy):
+            surf = self.surfaces.pop(gy, None)
+            if surf is not None:
+                self.free.append(surf)
+        self.lowest_gy = max(self.lowest_gy, min_gy)
+
+LANE_BG = LaneBackgroundCache()
+
+
+def draw_world(screen: pygame.Surface, world, camera_y_px: float, dirty: list | None = None,
+               alpha: float = 1.0, scale: float = 1.0) -> None:
+    min_visible_gy = max(0, int(camera_y_px // TILE) - 2)
+    max_visible_gy = int(camera_y_px // TILE) + ROWS + 2
+
+    # Scroll-blit the cached backgrounds
+    LANE_BG.sync(world, min_visible_gy, scale)
+    h = round(screen.get_height() / scale)
+    screen.blits([
+        (LANE_BG.get(world.get_lane(gy)), (0, int((h - (gy * TILE - camera_y_px) - TILE) * scale)))
+        for gy in range(min_visible_gy, max_visible_gy + 1)
+    ], False)
+
+    draw_movers(screen, world.movers, camera_y_px, min_visible_gy, max_visible_gy, dirty, alpha, scale)
+
+
+# =====================
+# Dirty-rectangle presentation
+# =====================
+class DirtyRectPresenter:
+    """Pushes only the changed parts of the frame with pygame.display.update(rects).
+
+    frame_key identifies everything that affects the picture; an unchanged key
+    (paused, game over) means the frame is skipped entirely. layout_key covers what
+    moves the whole picture (camera scroll, overlays); a change there forces a full
+    update. Otherwise the update covers this frame's sprite/HUD rects plus last frame's,
+    so vacated pixels are refreshed too.
+    """
+
+    def __init__(self):
+        self.frame_key = None
+        self.layout_key = None
+        self.prev_rects: list[pygame.Rect] = []
+
+    def needs_redraw(self, frame_key) -> bool:
+        return frame_key != self.frame_key
+
+    def present(self, frame_key, layout_key, rects: list[pygame.Rect]) -> None:
+        if layout_key != self.layout_key:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.prev_rects + rects)
+        self.frame_key = frame_key
+        self.layout_key = layout_key
+        self.prev_rects = rects
+
+
+# =====================
+# Internal-resolution rendering
+# =====================
+# Render scales offered; each keeps TILE (40 px) and the window a whole number of pixels.
+SCALE_STEPS = (0.5, 0.6, 0.75, 0.8, 1.0, 1.25, 1.5, 2.0)
+
+def nearest_scale(scale: float) -> float:
+    return min(SCALE_STEPS, key=lambda s: abs(s - scale))
+
+
+class ScaledOutput:
+    """Draws the world into an offscreen canvas at scale x (WIDTH, HEIGHT) and stretches
+    it over the window in one pass, so draw cost follows the internal resolution.
+
+    With dynamic=True the scale walks SCALE_STEPS to keep the world draw time near
+    budget_ms: down a step when the smoothed time runs over it, up a step when it is
+    comfortably under. The picture keeps the game's aspect ratio, letterboxed if needed.
+    """
+
+    def __init__(self, window: pygame.Surface, scale: float = 1.0, dynamic: bool = False,
+                 budget_ms: float = 8.0, min_scale: float = SCALE_STEPS[0], settle_frames: int = 30):
+        self.window = window
+        self.dynamic = dynamic
+        self.budget_ms = budget_ms
+        self.min_scale = min_scale
+        self.settle_frames = settle_frames
+        self.avg_ms = 0.0
+        self.frames_since_change = 0
+        self.viewport = self._fit(window.get_size())
+        window.fill((0, 0, 0))   # letterbox bars
+        self.canvas: pygame.Surface | None = None
+        self.set_scale(scale)
+
+    @staticmethod
+    def _fit(size: tuple[int, int]) -> pygame.Rect:
+        ww, wh = size
+        k = min(ww / WIDTH, wh / HEIGHT)
+        rect = pygame.Rect(0, 0, round(WIDTH * k), round(HEIGHT * k))
+        rect.center = (ww // 2, wh // 2)
+        return rect
+
+    def set_scale(self, scale: float) -> None:
+        self.scale = nearest_scale(scale)
+        size = (round(WIDTH * self.scale), round(HEIGHT * self.scale))
+        if self.canvas is None or self.canvas.get_size() != size:
+            self.canvas = pygame.Surface(size).convert()
+        self.frames_since_change = 0
+
+    def update(self, draw_ms: float) -> None:
+        """Feed the last world draw time; steps the scale when dynamic."""
+        self.avg_ms += (draw_ms - self.avg_ms) * 0.1
+        self.frames_since_change += 1
+        if not self.dynamic or self.frames_since_change < self.settle_frames:
+            return
+        i = SCALE_STEPS.index(self.scale)
+        if self.avg_ms > self.budget_ms and i > 0 and SCALE_STEPS[i - 1] >= self.min_scale:
+            self.set_scale(SCALE_STEPS[i - 1])
+        elif self.avg_ms < self.budget_ms * 0.5 and i + 1 < len(SCALE_STEPS) \
+                and SCALE_STEPS[i + 1] * HEIGHT <= self.viewport.height:
+            self.set_scale(SCALE_STEPS[i + 1])
+
+    def present(self) -> pygame.Surface:
+        """Stretch the canvas over the window; returns the viewport surface for the UI."""
+        view = self.window.subsurface(self.viewport)
+        if self.canvas.get_size() == self.viewport.size:
+            view.blit(self.canvas, (0, 0))
+        else:
+            pygame.transform.scale(self.canvas, self.viewport.size, view)
+        return view
@@ -0,0 +1,184 @@
+# replay.py
+"""Compact input recordings and deterministic replay.
+
+A session is its world seed plus the (tick, action) pairs fed to the fixed-step
+simulation, so re-simulating it reproduces the run exactly.
+
+    python replay.py run.crr                  # re-simulate headless, as fast as possible
+    python replay.py run.crr --render -s 4    # watch it at 4x
+"""
+from __future__ import annotations
+import argparse
+import struct
+import time
+
+from settings import SIM_HZ, SIM_DT
+from sim import Simulation, NOOP
+
+MAGIC = b"CRRP"
+VERSION = 1
+_HEADER = struct.Struct("<4sBHQI")   # magic, version, sim_hz, seed, start_gy
+
+
+def _put_varint(buf: bytearray, n: int) -> None:
+    while n >= 0x80:
+        buf.append((n & 0x7F) | 0x80)
+        n >>= 7
+    buf.append(n)
+
+def _get_varint(data: bytes, i: int) -> tuple[int, int]:
+    n = shift = 0
+    while True:
+        b = data[i]
+        i += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, i
+        shift += 7
+
+
+class Recording:
+    def __init__(self, seed: int, start_gy: int = 0, sim_hz: int = SIM_HZ):
+        self.seed = seed
+        self.start_gy = start_gy
+        self.sim_hz = sim_hz
+        self.inputs: list[tuple[int, int]] = []   # (tick, action), ticks increasing
+        self.end_tick = 0
+        self.final_score = 0
+        self.saved = False
+
+    def record(self, tick: int, action: int) -> None:
+        if action != NOOP:
+            self.inputs.append((tick, action))
+
+    def finish(self, sim: Simulation) -> None:
+        self.end_tick = sim.ticks
+        self.final_score = sim.player.score
+
+    def to_bytes(self) -> bytes:
+        buf = bytearray(_HEADER.pack(MAGIC, VERSION, self.sim_hz, self.seed, self.start_gy))
+        _put_varint(buf, len(self.inputs))
+        last = 0
+        for tick, action in self.inputs:
+            _put_varint(buf, tick - last)   # tick deltas stay small
+            buf.append(action)
+            last = tick
+        _put_varint(buf, self.end_tick)
+        _put_varint(buf, self.final_score)
+        return bytes(buf)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Recording:
+        magic, version, sim_hz, seed, start_gy = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("not a replay file")
+        if version != VERSION:
+            raise ValueError(f"unsupported replay version {version}")
+        rec = cls(seed, start_gy, sim_hz)
+        i = _HEADER.size
+        count, i = _get_varint(data, i)
+        tick = 0
+        for _ in range(count):
+            delta, i = _get_varint(data, i)
+            tick += delta
+            rec.inputs.append((tick, data[i]))
+            i += 1
+        rec.end_tick, i = _get_varint(data, i)
+        rec.final_score, i = _get_varint(data, i)
+        return rec
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> Recording:
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+class Replayer:
+    """Feeds a recording's inputs back into a fresh Simulation, one tick at a time."""
+
+    def __init__(self, rec: Recording):
+        if rec.sim_hz != SIM_HZ:
+            raise ValueError(f"recorded at {rec.sim_hz} Hz, simulation runs at {SIM_HZ} Hz")
+        self.rec = rec
+        self.sim = Simulation(rec.seed, rec.start_gy)
+        self.inputs = dict(rec.inputs)
+
+    @property
+    def done(self) -> bool:
+        return (not self.sim.player.alive) or self.sim.ticks >= self.rec.end_tick
+
+    def tick(self) -> None:
+        self.sim.step(SIM_DT, self.inputs.get(self.sim.ticks + 1, NOOP))
+
+    def run(self) -> Simulation:
+        while not self.done:
+            self.tick()
+        return self.sim
+
+
+def play_rendered(rec: Recording, speed: float) -> None:
+    import pygame
+    from settings import WIDTH, HEIGHT, FPS, TITLE, COLOR_BG
+    from render import draw_world, draw_player
+    from sim import FixedStep
+    from ui import draw_hud, draw_game_over, init_fonts
+
+    pygame.display.init()
+    pygame.font.init()
+    pygame.display.set_caption(f"{TITLE} - replay x{speed:g}")
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    clock = pygame.time.Clock()
+    init_fonts()
+
+    rp = Replayer(rec)
+    stepper = FixedStep(max_catchup=max(5, int(speed * 5)))
+    running = True
+    while running:
+        dt = clock.tick(FPS) / 1000.0
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                running = False
+        if not rp.done:
+            for _ in range(stepper.advance(dt * speed)):
+                rp.tick()
+                if rp.done:
+                    break
+
+        sim = rp.sim
+        screen.fill(COLOR_BG)
+        draw_world(screen, sim.world, sim.camera_y_px, alpha=stepper.alpha)
+        draw_player(screen, sim.player, sim.camera_y_px)
+        draw_hud(screen, sim.player.score, rec.final_score)
+        if not sim.player.alive:
+            draw_game_over(screen, sim.player.score)
+        pygame.display.flip()
+    pygame.quit()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Re-simulate or watch a recorded session.")
+    ap.add_argument("path")
+    ap.add_argument("--render", action="store_true", help="draw it instead of running headless")
+    ap.add_argument("-s", "--speed", type=float, default=1.0, help="playback speed when rendering")
+    args = ap.parse_args()
+
+    rec = Recording.load(args.path)
+    if args.render:
+        play_rendered(rec, args.speed)
+        return
+
+    t0 = time.perf_counter()
+    sim = Replayer(rec).run()
+    elapsed = time.perf_counter() - t0
+    ok = sim.ticks == rec.end_tick and sim.player.score == rec.final_score
+    print(f"seed={rec.seed} inputs={len(rec.inputs)} ticks={sim.ticks} score={sim.player.score} "
+          f"({elapsed * 1000:.1f} ms, {sim.ticks / max(elapsed, 1e-9):.0f} ticks/s)")
+    print("verified" if ok else f"MISMATCH: recorded ticks={rec.end_tick} score={rec.final_score}")
+    raise SystemExit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
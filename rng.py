@@ -0,0 +1,64 @@
+# rng.py
+"""Counter-based random numbers keyed by (seed, row, stream, ...).
+
+Every draw is a pure function of its key, so any lane can be generated (or
+regenerated after eviction) without replaying the lanes before it.
+"""
+from __future__ import annotations
+
+MASK64 = (1 << 64) - 1
+GOLDEN64 = 0x9E3779B97F4A7C15
+
+# Streams: independent sequences for the same row
+STREAM_KIND = 1
+STREAM_LANE = 2
+STREAM_SPAWN = 3
+
+
+def mix64(z: int) -> int:
+    """SplitMix64 finalizer: a bijective avalanche of a 64-bit integer."""
+    z = (z + GOLDEN64) & MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+    return z ^ (z >> 31)
+
+def hash_u64(*keys: int) -> int:
+    h = 0
+    for k in keys:
+        h = mix64(h ^ (k & MASK64))
+    return h
+
+def unit_float(*keys: int) -> float:
+    """One uniform draw in [0, 1) for the given key."""
+    return (hash_u64(*keys) >> 11) * (1.0 / (1 << 53))
+
+
+class KeyedRandom:
+    """Small random.Random look-alike whose i-th draw is mix64(hash(key) + i * GOLDEN64)."""
+
+    def __init__(self, *key: int):
+        self.state = hash_u64(*key)
+
+    def next_u64(self) -> int:
+        self.state = (self.state + GOLDEN64) & MASK64
+        return mix64(self.state)
+
+    def random(self) -> float:
+        return (self.next_u64() >> 11) * (1.0 / (1 << 53))
+
+    def uniform(self, a: float, b: float) -> float:
+        return a + (b - a) * self.random()
+
+    def randrange(self, n: int) -> int:
+        return int(self.random() * n)
+
+    def randint(self, a: int, b: int) -> int:
+        return a + self.randrange(b - a + 1)
+
+    def choice(self, seq):
+        return seq[self.randrange(len(seq))]
+
+    def shuffle(self, xs: list) -> None:
+        for i in range(len(xs) - 1, 0, -1):
+            j = self.randrange(i + 1)
+            xs[i], xs[j] = xs[j], xs[i]
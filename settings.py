@@ -1,10 +1,21 @@
 # settings.py
-import pygame
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pygame
 
 # Window
 WIDTH, HEIGHT = 480, 640
-FPS = 60
+FPS = 60                        # render cap
 TITLE = "Crossy Road (2D) - Clone"
+DIRTY_RECTS = False             # push only changed screen regions (for software-rendered displays)
+TELEMETRY_JSONL = None          # path: append one JSON record of phase timings per frame
+WINDOW_SIZE = None              # (w, h) output window; None = WIDTH x HEIGHT. The game is scaled to fit.
+RENDER_SCALE = 1.0              # world drawn at this fraction of WIDTH x HEIGHT (snapped to render.SCALE_STEPS)
+DYNAMIC_SCALE = False           # step RENDER_SCALE down/up to keep the world draw under RENDER_BUDGET_MS
+RENDER_BUDGET_MS = 8.0
+RECORD_DIR = None               # directory: save every game as a replay file (see replay.py)
 
 # Grid / tiles
 TILE = 40
@@ -12,9 +23,20 @@ COLS = WIDTH // TILE            # 12
 ROWS = HEIGHT // TILE           # 16
 CAMERA_MARGIN_TILES = 6         # keep player at least this many tiles above bottom when moving up
 
+# Simulation clock
+SIM_HZ = 60                     # fixed simulation tick rate
+SIM_DT = 1.0 / SIM_HZ
+MAX_CATCHUP_TICKS = 5           # after a hitch, run at most this many ticks in one frame and drop the rest
+
 # Gameplay
 MOVE_COOLDOWN = 0.08            # seconds; prevents super-fast key repeats
+AUTOPILOT = False               # start with the planning bot driving (F2 toggles)
+AUTOPILOT_BUDGET_MS = 2.0       # planner wall time per rendered frame, shared by its ticks (headless: per plan)
+INPUT_QUEUE_DEPTH = 2           # key presses buffered while the cooldown runs; extra presses are dropped
 MAX_GEN_AHEAD = 40              # generate lanes up to this many tiles ahead of camera top
+LANE_WINDOW = 96                # lanes kept in memory; older rows below the camera are evicted
+BACKGROUND_GEN = True           # build lanes ahead on a worker thread (main.py; headless sims stay single-threaded)
+GEN_CHUNK_ROWS = 16             # rows per worker chunk
 
 # Colors
 COLOR_BG = (25, 25, 28)
@@ -36,4 +58,10 @@ COLOR_TREE = (30, 90, 35)
 
 # Fonts
 def make_font(size: int) -> pygame.font.Font:
-    return pygame.font.SysFont(None, size)
+    # Imported here so the simulation modules can load settings without pygame.
+    import pygame
+    if not pygame.font.get_init():
+        pygame.font.init()
+    # pygame's bundled default font: what SysFont(None, ...) resolves to, minus the
+    # system font scan it runs first
+    return pygame.font.Font(None, size)
@@ -0,0 +1,196 @@
+# sim.py
+"""Headless simulation core: one game of World + Player, advanced by step(dt, action).
+
+Nothing in here (or in world/entities/difficulty) imports pygame, so balancing
+runs and bots can simulate thousands of games without SDL or a display.
+"""
+from __future__ import annotations
+import argparse
+import random
+import time
+from typing import Callable
+
+from settings import TILE, COLS, MOVE_COOLDOWN, CAMERA_MARGIN_TILES, SIM_HZ, SIM_DT, MAX_CATCHUP_TICKS
+from entities import Player
+from lanetypes import LANE_GRASS
+from utils import iter_bits
+from world import World
+
+# Actions (one per step; NOOP when no key was pressed)
+NOOP, UP, DOWN, LEFT, RIGHT = range(5)
+
+ACTION_DELTAS = {
+    NOOP:  (0, 0),
+    UP:    (0, 1),
+    DOWN:  (0, -1),
+    LEFT:  (-1, 0),
+    RIGHT: (1, 0),
+}
+
+
+def start_cell(world: World, start_gy: int) -> tuple[int, int]:
+    """Where a game starts: the first grass row at least two rows into the start, as close
+    to the middle as possible on a column with a way forward."""
+    gy = start_gy + 2
+    while world.get_lane(gy).kind != LANE_GRASS:
+        gy += 1
+    lane = world.get_lane(gy)
+    return min(iter_bits(lane.reach_mask), key=lambda x: abs(x - COLS // 2)), gy
+
+
+class Simulation:
+    def __init__(self, seed: int | None = None, start_gy: int = 0, background_gen: bool = False):
+        self.start_gy = start_gy
+        self.background_gen = background_gen   # see World / lanegen.py
+        self.world: World | None = None
+        self.reset(seed)
+
+    def reset(self, seed: int | None = None) -> None:
+        """Start a new game. seed=None picks a fresh random world."""
+        if self.world is None:
+            self.world = World(seed, self.start_gy, self.background_gen)
+        else:
+            self.world.reset(seed, self.start_gy)  # keep the lane pool and mover table
+        self.seed = self.world.seed
+        self.rng = random.Random(self.seed)  # for policies; the world has its own keyed RNG
+
+        gx, gy = start_cell(self.world, self.start_gy)
+        self.player = Player(gx=gx, gy=gy, alive=True, score=self.start_gy)
+        self.camera_y_px = float(self.start_gy * TILE)
+        self.time = 0.0
+        self.ticks = 0
+        self.last_move_time = -MOVE_COOLDOWN
+
+    def move_ready(self) -> bool:
+        """Whether the move cooldown has elapsed (in simulation time)."""
+        return self.time - self.last_move_time >= MOVE_COOLDOWN
+
+    def try_move(self, action: int) -> bool:
+        """Apply a discrete step if the cooldown allows it. Returns True if the player moved."""
+        dx, dy = ACTION_DELTAS.get(action, (0, 0))
+        if dx == 0 and dy == 0:
+            return False
+        if not self.move_ready():
+            return False
+
+        ngX = self.player.gx + dx
+        ngY = self.player.gy + dy
+        if not self.world.can_step_to(ngX, ngY):
+            return False
+
+        self.player.gx, self.player.gy = ngX, ngY
+        self.last_move_time = self.time
+
+        # scoring: max forward progress (gy)
+        self.player.score = max(self.player.score, self.player.gy)
+        return True
+
+    def step(self, dt: float, action: int = NOOP) -> bool:
+        """Advance one frame: input, camera, world, collisions. Returns player.alive."""
+        if not self.player.alive:
+            return False
+        self.begin_tick(dt)
+        self.try_move(action)
+        self.update_world(dt)
+        self.collide(dt)
+        return self.player.alive
+
+    # The phases of step(), exposed separately so main.py can time each one.
+    def begin_tick(self, dt: float) -> None:
+        self.time += dt
+        self.ticks += 1
+
+    def update_world(self, dt: float) -> None:
+        # Camera follows upward progress
+        target_camera = max(0.0, (self.player.gy - CAMERA_MARGIN_TILES) * TILE)
+        self.camera_y_px = max(self.camera_y_px, target_camera)
+        self.world.update(dt, self.camera_y_px, self.player.score)
+
+    def collide(self, dt: float) -> None:
+        self.world.check_collisions_and_water(self.player, dt)
+
+
+class FixedStep:
+    """Accumulator that turns variable frame times into whole fixed-size simulation ticks."""
+
+    def __init__(self, dt: float = SIM_DT, max_catchup: int = MAX_CATCHUP_TICKS):
+        self.dt = dt
+        self.max_catchup = max_catchup
+        self.acc = 0.0
+        self.dropped_ticks = 0
+
+    def advance(self, frame_dt: float) -> int:
+        """Add a frame's elapsed time; return how many ticks to run now."""
+        self.acc += frame_dt
+        n = int(self.acc / self.dt)
+        if n > self.max_catchup:
+            # Spiral-of-death guard: don't try to catch up on a long hitch, drop it.
+            self.dropped_ticks += n - self.max_catchup
+            n = self.max_catchup
+            self.acc = self.acc % self.dt
+        else:
+            self.acc -= n * self.dt
+        return n
+
+    @property
+    def alpha(self) -> float:
+        """How far the render time is into the next tick, for interpolation."""
+        return min(1.0, self.acc / self.dt)
+
+
+Policy = Callable[[Simulation], int]
+
+def random_policy(sim: Simulation) -> int:
+    return sim.rng.choice((NOOP, UP, UP, LEFT, RIGHT, DOWN))
+
+def forward_policy(sim: Simulation) -> int:
+    return UP
+
+
+def run_episode(policy: Policy, seed: int | None = None, max_ticks: int = 60 * SIM_HZ,
+                dt: float = SIM_DT, turbo: bool = True, start_gy: int = 0) -> Simulation:
+    """Play one game to death or max_ticks.
+
+    turbo=True runs as fast as the CPU allows; turbo=False paces ticks to wall-clock dt.
+    """
+    sim = Simulation(seed, start_gy)
+    next_tick = time.perf_counter()
+    while sim.player.alive and sim.ticks < max_ticks:
+        sim.step(dt, policy(sim))
+        if not turbo:
+            next_tick += dt
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+    return sim
+
+
+POLICIES = {"random": random_policy, "forward": forward_policy}
+
+def main():
+    ap = argparse.ArgumentParser(description="Run headless games (no pygame).")
+    ap.add_argument("--games", type=int, default=100)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--policy", choices=sorted(POLICIES), default="random")
+    ap.add_argument("--max-ticks", type=int, default=60 * SIM_HZ)
+    ap.add_argument("--start-gy", type=int, default=0, help="start this many rows deep")
+    ap.add_argument("--realtime", action="store_true", help="pace ticks to wall clock instead of turbo")
+    args = ap.parse_args()
+
+    policy = POLICIES[args.policy]
+    t0 = time.perf_counter()
+    ticks = 0
+    scores = []
+    for i in range(args.games):
+        sim = run_episode(policy, seed=args.seed + i, max_ticks=args.max_ticks,
+                          turbo=not args.realtime, start_gy=args.start_gy)
+        ticks += sim.ticks
+        scores.append(sim.player.score)
+    elapsed = time.perf_counter() - t0
+
+    print(f"games={args.games} ticks={ticks} elapsed={elapsed:.2f}s "
+          f"ticks/s={ticks / max(elapsed, 1e-9):.0f}")
+    print(f"score mean={sum(scores) / len(scores):.1f} max={max(scores)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# snapshot.py
+"""Compact, versioned binary snapshots of a running Simulation.
+
+Lanes are a pure function of (world seed, gy), so a snapshot stores only what play
+changes: the clocks, each visible lane's spawn cursor, the mover table's raw columns,
+the player and the policy RNG. Restoring into a Simulation on the same world keeps
+its lane ring as is, so rolling back a search or branching what-ifs costs tens of
+microseconds; a different world has its window of lanes rebuilt from the seed.
+
+    data = snapshot(sim)
+    ...
+    restore(sim, data)
+"""
+from __future__ import annotations
+import random
+import struct
+
+import numpy as np
+
+from settings import LANE_WINDOW
+from movers import N_KINDS
+from sim import Simulation
+
+MAGIC = b"CRSN"
+VERSION = 2
+
+_HEADER = struct.Struct("<4sHB")                # magic, version, flags
+_SIM = struct.Struct("<QqQddd")                 # seed, start_gy, ticks, time, last_move_time, camera_y_px
+_PLAYER = struct.Struct("<qq?qdB")              # gx, gy, alive, score, drift_px, death
+_WORLD = struct.Struct(f"<qqqq{N_KINDS}d")      # lowest_gy, highest_gen_gy, view_min, view_max, phase
+_MOVERS = struct.Struct("<I?")                  # rows, sorted
+_RNG = struct.Struct("<i?d")                    # random.Random version, has gauss_next, gauss_next
+
+FLAG_RNG = 1
+_MT_WORDS = 625                                 # Mersenne Twister state + index
+
+
+def snapshot(sim: Simulation, include_rng: bool = True) -> bytes:
+    world, player = sim.world, sim.player
+    parts = [
+        _HEADER.pack(MAGIC, VERSION, FLAG_RNG if include_rng else 0),
+        _SIM.pack(sim.seed, sim.start_gy, sim.ticks, sim.time, sim.last_move_time, sim.camera_y_px),
+        _PLAYER.pack(player.gx, player.gy, player.alive, player.score, player.drift_px, player.death),
+        _WORLD.pack(world.lowest_gy, world.highest_gen_gy, world.view_min, world.view_max, *world.phase),
+    ]
+    # Spawn cursors of the lanes whose movers are materialized
+    lanes = world.lanes
+    cursors = [lanes[gy % LANE_WINDOW].next_spawn for gy in range(world.view_min, world.view_max + 1)]
+    parts.append(np.asarray(cursors, dtype=np.int64).tobytes())
+
+    movers = world.movers
+    parts.append(_MOVERS.pack(movers.n, movers.sorted))
+    parts.append(movers.pack())
+
+    if include_rng:
+        version, state, gauss = sim.rng.getstate()
+        parts.append(_RNG.pack(version, gauss is not None, gauss or 0.0))
+        parts.append(np.asarray(state, dtype=np.uint32).tobytes())
+    return b"".join(parts)
+
+
+def restore(sim: Simulation, data: bytes) -> None:
+    """Put sim (any Simulation, e.g. a scratch copy for a bot) into the snapshot's state."""
+    view = memoryview(data)
+    magic, version, flags = _HEADER.unpack_from(view, 0)
+    if magic != MAGIC:
+        raise ValueError("not a snapshot")
+    if version != VERSION:
+        raise ValueError(f"unsupported snapshot version {version}")
+    off = _HEADER.size
+
+    seed, start_gy, ticks, t, last_move, cam = _SIM.unpack_from(view, off)
+    off += _SIM.size
+    gx, gy, alive, score, drift, death = _PLAYER.unpack_from(view, off)
+    off += _PLAYER.size
+    lowest, highest, view_min, view_max, *phase = _WORLD.unpack_from(view, off)
+    off += _WORLD.size
+
+    world = sim.world
+    same_world = world.seed == seed
+    world.seed = seed
+    world.pending.clear()
+    world.lowest_gy, world.highest_gen_gy = lowest, highest
+    world.view_min, world.view_max = view_min, view_max
+    world.held = []   # single-player snapshots: no crowd rows outside the view
+    world.phase[:] = phase
+
+    # Ring slots already holding the right row of this world are kept; others rebuilt.
+    # The row below is passed on only once it is known to be right (kept or rebuilt here).
+    lanes = world.lanes
+    below = None
+    for row in range(lowest, highest + 1):
+        slot = lanes[row % LANE_WINDOW]
+        if not (same_world and slot.gy == row):
+            world.build_lane(row, slot, below)
+        below = slot
+
+    n_view = max(0, view_max - view_min + 1)
+    cursors = np.frombuffer(view, dtype=np.int64, count=n_view, offset=off).tolist()
+    off += n_view * 8
+    for row, k in zip(range(view_min, view_max + 1), cursors):
+        lanes[row % LANE_WINDOW].next_spawn = k
+
+    n, sorted_ = _MOVERS.unpack_from(view, off)
+    off += _MOVERS.size
+    off += world.movers.unpack(n, view[off:], sorted_)
+
+    sim.seed = seed
+    sim.start_gy = start_gy
+    sim.ticks, sim.time, sim.last_move_time, sim.camera_y_px = ticks, t, last_move, cam
+    p = sim.player
+    p.gx, p.gy, p.alive, p.score, p.drift_px, p.death = gx, gy, alive, score, drift, death
+
+    if flags & FLAG_RNG:
+        rng_version, has_gauss, gauss = _RNG.unpack_from(view, off)
+        off += _RNG.size
+        state = tuple(np.frombuffer(view, dtype=np.uint32, count=_MT_WORDS, offset=off).tolist())
+        if not isinstance(sim.rng, random.Random):
+            sim.rng = random.Random()
+        sim.rng.setstate((rng_version, state, gauss if has_gauss else None))
@@ -0,0 +1,160 @@
+# sweep.py
+"""Difficulty tuning sweep: headless games over a grid of difficulty.Tuning values.
+
+Every configuration plays the same seeds (so differences come from the tuning, not
+the worlds), with the games spread over a process pool. Per configuration it reports
+survival depth, how games ended, and mover density.
+
+    python sweep.py -p car.per_score=0.005,0.007,0.009 -p max_spawn_interval=3,4
+    python sweep.py -p log.start_mult=0.3,0.4 --policy bot --games 40 --csv out.csv
+"""
+from __future__ import annotations
+import argparse
+import csv
+import dataclasses
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import difficulty
+from difficulty import Tuning
+from entities import DEATH_NAMES, DEATH_NONE, DEATH_BEHIND
+from settings import SIM_DT, SIM_HZ, LANE_WINDOW
+from sim import Simulation, POLICIES
+
+DENSITY_EVERY = SIM_HZ // 4   # ticks between mover-density samples
+
+
+def parse_param(spec: str) -> tuple[str, list[float]]:
+    """"car.per_score=0.005,0.007" -> ("car.per_score", [0.005, 0.007])."""
+    name, sep, values = spec.partition("=")
+    if not sep or not values:
+        raise argparse.ArgumentTypeError(f"expected NAME=V1,V2,... got {spec!r}")
+    get_field(Tuning(), name)   # validate the name
+    return name, [float(v) for v in values.split(",")]
+
+def get_field(tuning: Tuning, name: str) -> float:
+    obj = tuning
+    for part in name.split("."):
+        if not dataclasses.is_dataclass(obj) or part not in {f.name for f in dataclasses.fields(obj)}:
+            raise argparse.ArgumentTypeError(f"unknown tuning parameter {name!r}")
+        obj = getattr(obj, part)
+    return obj
+
+def with_field(obj, name: str, value: float):
+    head, _, rest = name.partition(".")
+    if rest:
+        value = with_field(getattr(obj, head), rest, value)
+    return dataclasses.replace(obj, **{head: value})
+
+def grid(params: list[tuple[str, list[float]]], base: Tuning = Tuning()) -> list[tuple[dict, Tuning]]:
+    """Cartesian product of the parameter values, as ({name: value}, Tuning) pairs."""
+    names = [n for n, _ in params]
+    out = []
+    for values in itertools.product(*(v for _, v in params)):
+        tuning = base
+        for n, v in zip(names, values):
+            tuning = with_field(tuning, n, v)
+        out.append((dict(zip(names, values)), tuning))
+    return out
+
+
+def play(task: tuple) -> tuple[int, int, int, int, float]:
+    """Worker: one game. Returns (config index, score, ticks, death cause, movers per traffic lane)."""
+    index, tuning, policy_name, seed, max_ticks, budget_ms = task
+    difficulty.set_tuning(tuning)
+    if policy_name == "bot":
+        from bot import Autopilot
+        policy = Autopilot(budget_ms).next_action
+    else:
+        policy = POLICIES[policy_name]
+
+    sim = Simulation(seed)
+    world = sim.world
+    samples = []
+    while sim.player.alive and sim.ticks < max_ticks:
+        sim.step(SIM_DT, policy(sim))
+        if sim.ticks % DENSITY_EVERY == 0:
+            lanes = sum(world.lanes[gy % LANE_WINDOW].ltype.mover_kind is not None
+                        for gy in range(world.view_min, world.view_max + 1))
+            if lanes:
+                samples.append(world.movers.n / lanes)
+    density = sum(samples) / len(samples) if samples else 0.0
+    return index, sim.player.score, sim.ticks, sim.player.death, density
+
+
+def run_sweep(configs: list[tuple[dict, Tuning]], games: int, seed: int = 0, policy: str = "random",
+              max_ticks: int = 60 * SIM_HZ, budget_ms: float = 2.0, workers: int | None = None) -> list[dict]:
+    tasks = [(i, tuning, policy, seed + g, max_ticks, budget_ms)
+             for i, (_, tuning) in enumerate(configs) for g in range(games)]
+    per_config = [[] for _ in configs]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for r in map(play, tasks):
+            per_config[r[0]].append(r[1:])
+        difficulty.set_tuning(Tuning())
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            for r in pool.map(play, tasks, chunksize=max(1, len(tasks) // (workers * 8))):
+                per_config[r[0]].append(r[1:])
+
+    rows = []
+    for (params, _), games_ in zip(configs, per_config):
+        score, ticks, death, density = (np.asarray(c) for c in zip(*games_))
+        row = dict(params)
+        row["games"] = len(score)
+        row["depth_mean"] = round(float(score.mean()), 1)
+        row["depth_p50"] = float(np.percentile(score, 50))
+        row["depth_p90"] = float(np.percentile(score, 90))
+        row["secs_mean"] = round(float(ticks.mean()) / SIM_HZ, 1)
+        for cause, name in enumerate(DEATH_NAMES):
+            if cause == DEATH_BEHIND:
+                continue   # crowd agents only
+            # "none" = still alive at max_ticks
+            row["timeout" if cause == DEATH_NONE else name] = round(float((death == cause).mean()), 3)
+        row["movers_per_lane"] = round(float(density.mean()), 2)
+        rows.append(row)
+    return rows
+
+
+def print_table(rows: list[dict]) -> None:
+    cols = list(rows[0])
+    widths = [max(len(c), *(len(f"{r[c]:g}") for r in rows)) for c in cols]
+    print("  ".join(c.rjust(w) for c, w in zip(cols, widths)))
+    for r in rows:
+        print("  ".join(f"{r[c]:g}".rjust(w) for c, w in zip(cols, widths)))
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Sweep difficulty tuning over headless games.")
+    ap.add_argument("-p", "--param", action="append", type=parse_param, default=[],
+                    help="NAME=V1,V2,... e.g. car.per_score=0.005,0.007 (repeat for a grid)")
+    ap.add_argument("--games", type=int, default=20, help="games per configuration")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--policy", choices=sorted(POLICIES) + ["bot"], default="random")
+    ap.add_argument("--budget-ms", type=float, default=2.0, help="autopilot planning budget")
+    ap.add_argument("--max-ticks", type=int, default=60 * SIM_HZ)
+    ap.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    ap.add_argument("--csv", help="also write the table here")
+    args = ap.parse_args()
+
+    configs = grid(args.param)
+    t0 = time.perf_counter()
+    rows = run_sweep(configs, args.games, args.seed, args.policy, args.max_ticks,
+                     args.budget_ms, args.workers)
+    elapsed = time.perf_counter() - t0
+
+    print_table(rows)
+    print(f"configs={len(configs)} games={len(configs) * args.games} policy={args.policy} "
+          f"elapsed={elapsed:.1f}s")
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            w = csv.DictWriter(f, fieldnames=list(rows[0]))
+            w.writeheader()
+            w.writerows(rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+# tests/test_crowd.py
+from __future__ import annotations
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from settings import SIM_DT
+from bot import Autopilot
+from crowd import Crowd
+from sim import Simulation, NOOP, UP, DOWN, LEFT, RIGHT
+
+
+def play_both(seed: int, view_lanes: bool, bot: Autopilot | None, max_ticks: int) -> None:
+    sim = Simulation(seed)
+    crowd = Crowd(1, seed, view_lanes=view_lanes)
+    rng = np.random.default_rng(seed)
+    while sim.player.alive and sim.ticks < max_ticks:
+        if bot is not None:
+            action = bot.plan(sim) if sim.move_ready() else NOOP
+        else:
+            action = int(rng.choice([NOOP, UP, UP, LEFT, RIGHT, DOWN]))
+        sim.step(SIM_DT, action)
+        crowd.step(SIM_DT, np.array([action]))
+
+        p = sim.player
+        assert (p.gx, p.gy, p.drift_px, p.alive, p.score, p.death) == (
+            int(crowd.gx[0]), int(crowd.gy[0]), float(crowd.drift[0]), bool(crowd.alive[0]),
+            int(crowd.score[0]), int(crowd.death[0])), sim.ticks
+
+
+@pytest.mark.parametrize("view_lanes", [False, True])
+@pytest.mark.parametrize("seed", range(40))
+def test_crowd_of_one_plays_like_simulation(seed, view_lanes):
+    play_both(seed, view_lanes, None, 1500)
+
+
+@pytest.mark.parametrize("view_lanes", [False, True])
+@pytest.mark.parametrize("seed", range(3))
+def test_crowd_of_one_follows_the_bot_like_simulation(seed, view_lanes):
+    # The bot lives long enough to ride logs and reach faster traffic
+    play_both(seed, view_lanes, Autopilot(1.0), 1000)
@@ -0,0 +1,26 @@
+# tests/test_lanegen.py
+from __future__ import annotations
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from settings import GEN_CHUNK_ROWS
+from world import World
+
+
+def test_new_seed_lowers_the_worker_target():
+    world = World(1, background_gen=True)
+    try:
+        world.ensure_generated(0, 3000)
+        world.reset(2)
+        world.ensure_generated(0, 60)
+        assert world.generator._target == 60 + GEN_CHUNK_ROWS * 2
+
+        time.sleep(0.3)   # let the worker finish whatever it was asked for
+        world.ensure_generated(0, 61)
+        assert len(world.pending) <= GEN_CHUNK_ROWS * 2
+        assert all(lane.seed == 2 for lane in world.pending.values())
+    finally:
+        world.close()
@@ -0,0 +1,79 @@
+# tests/test_movers.py
+from __future__ import annotations
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from settings import TILE, SIM_DT
+from entities import Player, DEATH_CAR
+from lanetypes import LANE_ROAD
+from movers import MoverTable, MAX_W_TILES, KIND_CAR
+from world import World
+
+
+def random_table(rng: np.random.Generator, lanes: int = 6, per_lane: int = 12) -> MoverTable:
+    movers = MoverTable(capacity=4)
+    for _ in range(lanes * per_lane):
+        movers.add(float(rng.uniform(-300, 900)), int(rng.integers(lanes)), int(rng.integers(1, MAX_W_TILES + 1)),
+                   100.0, 100.0, 1, KIND_CAR)
+    movers.ensure_sorted()
+    return movers
+
+
+def linear_first_overlap(movers: MoverTable, gy: int, a: int, b: int) -> int:
+    for j in range(movers.n):
+        left = int(movers.x[j])
+        if movers.gy[j] == gy and left < b and a < left + int(movers.w[j]) * TILE:
+            return j
+    return -1
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_first_overlap_matches_linear_scan(seed):
+    rng = np.random.default_rng(seed)
+    movers = random_table(rng)
+    gy = rng.integers(-1, 7, size=200)
+    a = rng.integers(-400, 1000, size=200)
+    b = a + rng.integers(1, 3 * TILE, size=200)
+
+    want = [linear_first_overlap(movers, int(g), int(x), int(y)) for g, x, y in zip(gy, a, b)]
+    assert [movers.first_overlap(int(g), int(x), int(y)) for g, x, y in zip(gy, a, b)] == want
+    assert movers.first_overlaps(gy, a, b).tolist() == want
+
+
+def road_row(world: World) -> int:
+    return next(gy for gy in range(60) if world.get_lane(gy).kind == LANE_ROAD)
+
+
+@pytest.mark.parametrize("direction", [1, -1])
+def test_swept_hit_on_a_mover_that_crossed_the_player(direction):
+    world = World(0)
+    gy = road_row(world)
+    player = Player(gx=5, gy=gy)
+    a, b = player.span_x()
+    speed = 3 * TILE / SIM_DT   # three tiles per tick: from one side of the player to the other
+    # Where the mover is after a tick that started with it on the player's other side
+    x = b + TILE if direction > 0 else a - 2 * TILE
+    world.movers.clear()
+    world.movers.add(float(x), gy, 1, speed, speed, direction, KIND_CAR)
+
+    assert world.movers.first_overlap(gy, a, b) == -1   # no overlap at the sampled position
+    world.check_collisions_and_water(player, SIM_DT)
+    assert not player.alive
+    assert player.death == DEATH_CAR
+
+
+def test_slow_mover_beside_the_player_misses():
+    world = World(0)
+    gy = road_row(world)
+    player = Player(gx=5, gy=gy)
+    _, b = player.span_x()
+    world.movers.clear()
+    world.movers.add(float(b + TILE), gy, 1, 60.0, 60.0, 1, KIND_CAR)
+
+    world.check_collisions_and_water(player, SIM_DT)
+    assert player.alive
@@ -0,0 +1,56 @@
+# tests/test_replay.py
+from __future__ import annotations
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from settings import SIM_DT
+from bot import Autopilot
+from input_queue import InputQueue
+from replay import Recording, Replayer
+from sim import Simulation, UP, DOWN, LEFT, RIGHT
+
+
+def record_like_main(seed: int, source, press=None, max_ticks: int = 3000) -> tuple[Recording, Simulation]:
+    """Play the way main.py's frame loop does: split-phase ticks, a few per frame."""
+    sim = Simulation(seed)
+    rec = Recording(sim.seed)
+    rng = np.random.default_rng(seed)
+    while sim.player.alive and sim.ticks < max_ticks:
+        if press is not None:
+            press(rng)
+        for _ in range(int(rng.integers(0, 4))):   # FixedStep: 0..3 ticks this frame
+            sim.begin_tick(SIM_DT)
+            action = source.next_action(sim)
+            rec.record(sim.ticks, action)
+            sim.try_move(action)
+            sim.update_world(SIM_DT)
+            sim.collide(SIM_DT)
+            if not sim.player.alive:
+                break
+    rec.finish(sim)
+    return rec, sim
+
+
+def assert_replays(rec: Recording, sim: Simulation) -> None:
+    replayed = Replayer(Recording.from_bytes(rec.to_bytes())).run()
+    assert replayed.ticks == rec.end_tick == sim.ticks
+    assert replayed.player == sim.player
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_keyboard_session_replays(seed):
+    inputs = InputQueue()
+    def press(rng):
+        if rng.random() < 0.3:
+            inputs.push(int(rng.choice([UP, UP, UP, LEFT, RIGHT, DOWN])))
+    assert_replays(*record_like_main(seed, inputs, press))
+
+
+@pytest.mark.parametrize("seed", range(2))
+def test_autopilot_session_replays(seed):
+    assert_replays(*record_like_main(seed, Autopilot(1.0), max_ticks=1500))
@@ -0,0 +1,23 @@
+# tests/test_vecenv.py
+from __future__ import annotations
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from settings import COLS
+from vecenv import VecEnv, observe, OBS_ROWS
+
+
+def test_batched_observations_match_observe():
+    env = VecEnv(16, seed=3, frame_skip=2)
+    env.reset()
+    rng = np.random.default_rng(1)
+    out = np.zeros((OBS_ROWS, COLS), dtype=np.int8)
+    for _ in range(300):
+        obs, _, _ = env.step(rng.choice([0, 1, 1, 2, 3, 4], size=env.n))
+        for i, sim in enumerate(env.backend.sims):
+            observe(sim, out)
+            np.testing.assert_array_equal(obs[i], out)
@@ -1,50 +1,132 @@
 # ui.py
+"""HUD and overlays, composited from cached surfaces.
+
+Text is rendered once per (font, string) and each overlay keeps one surface that
+is repainted only when what it shows changes, so a paused or game-over screen
+costs a single blit per frame.
+"""
 from __future__ import annotations
+from typing import Callable
+
 import pygame
-from settings import COLOR_TEXT, make_font, WIDTH, HEIGHT
+from settings import COLOR_TEXT, make_font
 
+FONT_16 = None
 FONT_24 = None
 FONT_40 = None
 
 def init_fonts():
-    global FONT_24, FONT_40
+    global FONT_16, FONT_24, FONT_40
+    FONT_16 = make_font(16)
     FONT_24 = make_font(24)
     FONT_40 = make_font(40)
+    TEXT.clear()
+
+
+class TextCache:
+    """Rendered text surfaces keyed by (font, text, color)."""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self.surfaces: dict[tuple, pygame.Surface] = {}
+
+    def clear(self) -> None:
+        self.surfaces.clear()
+
+    def get(self, font: pygame.font.Font, text: str, color=COLOR_TEXT) -> pygame.Surface:
+        key = (id(font), text, color)
+        surf = self.surfaces.get(key)
+        if surf is None:
+            if len(self.surfaces) >= self.max_entries:
+                self.surfaces.clear()   # scores only grow; old strings won't come back
+            surf = self.surfaces[key] = font.render(text, True, color)
+        return surf
+
+
+_UNPAINTED = object()
+
+class UILayer:
+    """One reusable surface, repainted only when its content key changes."""
+
+    def __init__(self, size: tuple[int, int]):
+        self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        self.key = _UNPAINTED
+
+    def get(self, key, paint: Callable[[pygame.Surface], None]) -> pygame.Surface:
+        if key != self.key:
+            self.surface.fill((0, 0, 0, 0))
+            paint(self.surface)
+            self.key = key
+        return self.surface
 
-def draw_hud(screen: pygame.Surface, score: int, best: int) -> None:
+
+TEXT = TextCache()
+_LAYERS: dict[str, UILayer] = {}
+
+def _layer(name: str, size: tuple[int, int]) -> UILayer:
+    layer = _LAYERS.get(name)
+    if layer is None or layer.surface.get_size() != size:
+        layer = _LAYERS[name] = UILayer(size)
+    return layer
+
+def _blit_centered(surf: pygame.Surface, text: pygame.Surface, y: int) -> None:
+    surf.blit(text, (surf.get_width()//2 - text.get_width()//2, y))
+
+
+def draw_hud(screen: pygame.Surface, score: int, best: int) -> pygame.Rect:
     if FONT_24 is None:
         init_fonts()
 
-    text = FONT_24.render(f"Score: {score}   Best: {best}", True, COLOR_TEXT)
-    screen.blit(text, (12, 10))
+    text = TEXT.get(FONT_24, f"Score: {score}   Best: {best}")
+    return screen.blit(text, (12, 10))
 
 def draw_game_over(screen: pygame.Surface, score: int) -> None:
     if FONT_40 is None:
         init_fonts()
 
-    overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 140))
-    screen.blit(overlay, (0, 0))
-
-    title = FONT_40.render("Game Over", True, COLOR_TEXT)
-    hint  = FONT_24.render("Press R to restart", True, COLOR_TEXT)
-    sc    = FONT_24.render(f"Score: {score}", True, COLOR_TEXT)
+    w, h = screen.get_size()
+    def paint(surf: pygame.Surface) -> None:
+        surf.fill((0, 0, 0, 140))
+        _blit_centered(surf, TEXT.get(FONT_40, "Game Over"), h//2 - 70)
+        _blit_centered(surf, TEXT.get(FONT_24, f"Score: {score}"), h//2 - 25)
+        _blit_centered(surf, TEXT.get(FONT_24, "Press R to restart"), h//2 + 15)
 
-    screen.blit(title, (WIDTH//2 - title.get_width()//2, HEIGHT//2 - 70))
-    screen.blit(sc,    (WIDTH//2 - sc.get_width()//2,    HEIGHT//2 - 25))
-    screen.blit(hint,  (WIDTH//2 - hint.get_width()//2,  HEIGHT//2 + 15))
+    screen.blit(_layer("game_over", (w, h)).get(score, paint), (0, 0))
 
 def draw_paused(screen: pygame.Surface) -> None:
     if FONT_40 is None:
         init_fonts()
 
     w, h = screen.get_size()
-    overlay = pygame.Surface((w, h), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 120))
-    screen.blit(overlay, (0, 0))
+    def paint(surf: pygame.Surface) -> None:
+        surf.fill((0, 0, 0, 120))
+        _blit_centered(surf, TEXT.get(FONT_40, "Paused"), h//2 - 50)
+        _blit_centered(surf, TEXT.get(FONT_24, "Press P to resume"), h//2 + 5)
+
+    screen.blit(_layer("paused", (w, h)).get(None, paint), (0, 0))
+
+def draw_debug_overlay(screen: pygame.Surface, lines: list[str]) -> pygame.Rect:
+    if FONT_16 is None:
+        init_fonts()
+
+    key = tuple(lines)
+    layer = _LAYERS.get("debug")
+    if layer is None or layer.key != key:
+        # Panel size depends on the text, so the surface is rebuilt with it
+        surfs = [FONT_16.render(line, True, COLOR_TEXT) for line in lines]
+        w = max(s.get_width() for s in surfs) + 12
+        h = sum(s.get_height() for s in surfs) + 10
+
+        def paint(panel: pygame.Surface) -> None:
+            panel.fill((0, 0, 0, 160))
+            yy = 5
+            for s in surfs:
+                panel.blit(s, (6, yy))
+                yy += s.get_height()
 
-    title = FONT_40.render("Paused", True, COLOR_TEXT)
-    hint  = FONT_24.render("Press P to resume", True, COLOR_TEXT)
+        layer = _layer("debug", (w, h))
+        layer.get(key, paint)
 
-    screen.blit(title, (w//2 - title.get_width()//2, h//2 - 50))
-    screen.blit(hint,  (w//2 - hint.get_width()//2,  h//2 + 5))
+    panel = layer.surface
+    x, y = screen.get_width() - panel.get_width() - 8, 36
+    return screen.blit(panel, (x, y))
@@ -5,6 +5,22 @@ from dataclasses import dataclass
 def clamp(x: float, lo: float, hi: float) -> float:
     return max(lo, min(hi, x))
 
+def iter_bits(mask: int):
+    """Yield the index of every set bit, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+def flood_bits(seed: int, free: int) -> int:
+    """Bits of free connected to seed & free through neighbouring set bits (a 1-D flood fill)."""
+    reach = seed & free
+    while True:
+        grown = (reach | (reach << 1) | (reach >> 1)) & free
+        if grown == reach:
+            return reach
+        reach = grown
+
 @dataclass(frozen=True)
 class IPoint:
     x: int
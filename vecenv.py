@@ -0,0 +1,218 @@
+# vecenv.py
+"""Gym-style vectorized environment: N independent games stepped in lockstep.
+
+    env = VecEnv(256, seed=0)                  # in-process
+    env = VecEnv(256, seed=0, backend="mp")    # worker pool, same interface
+    obs = env.reset()
+    obs, rewards, dones = env.step(actions)    # NumPy arrays, one entry per game
+
+Finished games reset automatically (like main.py's restart), so the arrays always
+describe N live games; where dones[i] is set, env.last_scores[i] is the score that game ended with.
+
+Throughput is about 10,000 env-steps/s per core (inproc, N=64..256, frame_skip=1,
+random actions), of which ~70% is each game's World.update. The hundreds of
+thousands of steps/s a training run wants therefore need the "mp" backend over a few
+dozen cores.
+"""
+from __future__ import annotations
+import multiprocessing as mp
+
+import numpy as np
+
+from settings import TILE, COLS, SIM_DT, SIM_HZ
+from dangermap import DangerMap, MAP_BELOW, MAP_ABOVE
+from lanetypes import COLLIDE_HIT, COLLIDE_RIDE, LANE_TYPES
+from sim import Simulation, NOOP
+
+# Observation: lane cells around the player, rows OBS_BELOW below to OBS_ABOVE above
+# (the world's DangerMap window)
+OBS_BELOW = MAP_BELOW
+OBS_ABOVE = MAP_ABOVE
+OBS_ROWS = OBS_BELOW + 1 + OBS_ABOVE
+
+# Cell codes
+CELL_FREE, CELL_TREE, CELL_VEHICLE, CELL_WATER, CELL_LOG, CELL_PLAYER, CELL_WALL = range(7)
+
+# Background cell of a row by lane kind; index -1 (below row 0) is wall
+_ROW_CELL = np.array([CELL_WATER if t.collision == COLLIDE_RIDE else CELL_FREE for t in LANE_TYPES]
+                     + [CELL_WALL], dtype=np.int8)
+_HIT = np.array([t.collision == COLLIDE_HIT for t in LANE_TYPES] + [False])
+_COL_SHIFT = np.arange(COLS)
+
+
+def observe(sim: Simulation, out: np.ndarray) -> None:
+    """Fill out (OBS_ROWS, COLS) int8 with cell codes; row 0 is OBS_BELOW rows below the player."""
+    player = sim.player
+    dm = sim.world.danger_map(player.gy)
+    out[:] = _ROW_CELL[dm.kind][:, None]
+    out[dm.blocked & (dm.kind >= 0)[:, None]] = CELL_TREE
+    out[dm.cover > 0] = CELL_VEHICLE
+    out[dm.log > 0] = CELL_LOG
+    out[OBS_BELOW, player.gx] = CELL_PLAYER
+
+
+class BatchSims:
+    """In-process backend: a list of Simulations advanced one after another.
+
+    Observations are built for the whole batch at once: each game only scrolls the
+    static rows of its own DangerMap, then the movers of every game's window are
+    gathered into one array and turned into covered cells with a few NumPy
+    operations, the same cells observe() marks.
+    """
+
+    def __init__(self, seeds: list[int], stride: int, frame_skip: int, max_ticks: int):
+        self.stride = stride          # added to a game's seed on every auto-reset
+        self.frame_skip = frame_skip
+        self.max_ticks = max_ticks
+        self.next_seeds = list(seeds)
+        self.sims = [Simulation(s) for s in seeds]
+        n = len(seeds)
+        self.maps = [DangerMap(OBS_BELOW, OBS_ABOVE) for _ in seeds]
+        self.kind = np.zeros((n, OBS_ROWS), dtype=np.int8)
+        self.blocked = np.zeros((n, OBS_ROWS, COLS), dtype=bool)
+        self.obs = np.zeros((n, OBS_ROWS, COLS), dtype=np.int8)
+        self.rewards = np.zeros(n, dtype=np.float32)
+        self.dones = np.zeros(n, dtype=bool)
+        self.last_scores = np.zeros(n, dtype=np.int64)
+
+    def reset(self) -> np.ndarray:
+        for i, sim in enumerate(self.sims):
+            sim.reset(self.next_seeds[i])
+        self.observe_all()
+        return self.obs.copy()
+
+    def observe_all(self) -> None:
+        """observe() for every game into self.obs."""
+        n = len(self.sims)
+        gx = np.empty(n, dtype=np.int64)
+        base = np.empty(n, dtype=np.int64)
+        xs, ws, gys, counts = [], [], [], []
+        for i, sim in enumerate(self.sims):
+            player, world = sim.player, sim.world
+            dm = self.maps[i].update_static(world, player.gy)
+            self.kind[i] = dm.kind
+            self.blocked[i] = dm.blocked
+            gx[i], base[i] = player.gx, dm.base
+            movers = world.movers
+            movers.ensure_sorted()
+            lo, hi = np.searchsorted(movers.gy, (dm.base, dm.base + OBS_ROWS))
+            xs.append(movers.x[lo:hi])
+            ws.append(movers.w[lo:hi])
+            gys.append(movers.gy[lo:hi])
+            counts.append(hi - lo)
+
+        # Columns each mover covers, as bits, OR-ed into its game's row
+        game = np.repeat(np.arange(n), counts)
+        left = np.concatenate(xs).astype(np.int64)   # same truncation as first_overlap
+        right = left + np.concatenate(ws) * TILE
+        c0 = np.clip(left // TILE, 0, COLS)
+        c1 = np.clip(-(-right // TILE), 0, COLS)
+        bits = np.where(c1 > c0, (1 << c1) - (1 << c0), 0)
+        covered = np.zeros((n, OBS_ROWS), dtype=np.int64)
+        np.bitwise_or.at(covered, (game, np.concatenate(gys) - base[game]), bits)
+        covered = ((covered[:, :, None] >> _COL_SHIFT) & 1).astype(bool)
+
+        kind, obs = self.kind, self.obs
+        obs[:] = _ROW_CELL[kind][:, :, None]
+        obs[self.blocked & (kind >= 0)[:, :, None]] = CELL_TREE
+        hit = _HIT[kind][:, :, None]
+        obs[covered & hit] = CELL_VEHICLE
+        obs[covered & ~hit] = CELL_LOG
+        obs[np.arange(n), OBS_BELOW, gx] = CELL_PLAYER
+
+    def step(self, actions: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        for i, sim in enumerate(self.sims):
+            before = sim.player.score
+            action = int(actions[i])
+            for _ in range(self.frame_skip):
+                if not sim.step(SIM_DT, action):
+                    break
+                action = NOOP
+            player = sim.player
+            self.rewards[i] = player.score - before
+            done = (not player.alive) or sim.ticks >= self.max_ticks
+            self.dones[i] = done
+            if done:
+                self.last_scores[i] = player.score
+                self.next_seeds[i] += self.stride
+                sim.reset(self.next_seeds[i])
+        self.observe_all()
+        return self.obs.copy(), self.rewards.copy(), self.dones.copy(), self.last_scores.copy()
+
+
+def _worker(conn, seeds, stride, frame_skip, max_ticks):
+    batch = BatchSims(seeds, stride, frame_skip, max_ticks)
+    while True:
+        cmd, arg = conn.recv()
+        if cmd == "step":
+            conn.send(batch.step(arg))
+        elif cmd == "reset":
+            conn.send(batch.reset())
+        elif cmd == "close":
+            conn.close()
+            return
+
+
+class PoolSims:
+    """Multiprocessing backend: each worker process owns a contiguous slice of the games."""
+
+    def __init__(self, seeds: list[int], stride: int, frame_skip: int, max_ticks: int, workers: int):
+        workers = max(1, min(workers, len(seeds)))
+        bounds = np.linspace(0, len(seeds), workers + 1).astype(int)
+        self.slices = [(int(lo), int(hi)) for lo, hi in zip(bounds[:-1], bounds[1:])]
+        ctx = mp.get_context("spawn")
+        self.conns = []
+        self.procs = []
+        for lo, hi in self.slices:
+            parent, child = ctx.Pipe()
+            p = ctx.Process(target=_worker, args=(child, seeds[lo:hi], stride, frame_skip, max_ticks),
+                            daemon=True)
+            p.start()
+            self.conns.append(parent)
+            self.procs.append(p)
+
+    def reset(self) -> np.ndarray:
+        for c in self.conns:
+            c.send(("reset", None))
+        return np.concatenate([c.recv() for c in self.conns])
+
+    def step(self, actions: np.ndarray):
+        for c, (lo, hi) in zip(self.conns, self.slices):
+            c.send(("step", actions[lo:hi]))
+        parts = [c.recv() for c in self.conns]
+        return tuple(np.concatenate(col) for col in zip(*parts))
+
+    def close(self) -> None:
+        for c in self.conns:
+            c.send(("close", None))
+        for p in self.procs:
+            p.join(timeout=1.0)
+
+
+class VecEnv:
+    def __init__(self, n: int, seed: int = 0, backend: str = "inproc", workers: int | None = None,
+                 frame_skip: int = 1, max_ticks: int = 120 * SIM_HZ):
+        seeds = [seed + i for i in range(n)]
+        self.n = n
+        if backend == "inproc":
+            self.backend = BatchSims(seeds, n, frame_skip, max_ticks)
+        elif backend == "mp":
+            self.backend = PoolSims(seeds, n, frame_skip, max_ticks, workers or mp.cpu_count())
+        else:
+            raise ValueError(f"unknown backend {backend!r} (use 'inproc' or 'mp')")
+        self.observation_shape = (OBS_ROWS, COLS)
+        self.num_actions = 5
+        self.last_scores = np.zeros(n, dtype=np.int64)
+
+    def reset(self) -> np.ndarray:
+        return self.backend.reset()
+
+    def step(self, actions) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Returns (obs[n, OBS_ROWS, COLS] int8, rewards[n] float32, dones[n] bool)."""
+        obs, rewards, dones, last_scores = self.backend.step(np.asarray(actions, dtype=np.int8))
+        self.last_scores = last_scores
+        return obs, rewards, dones
+
+    def close(self) -> None:
+        if hasattr(self.backend, "close"):
+            self.backend.close()
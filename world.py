@@ -1,369 +1,457 @@
 # world.py
 from __future__ import annotations
 from dataclasses import dataclass
+import itertools
+import math
+import queue
 import random
-import pygame
+import numpy as np
 import difficulty
+from rng import MASK64, KeyedRandom, unit_float, STREAM_KIND, STREAM_LANE, STREAM_SPAWN
 
 
 from settings import (
-    TILE, WIDTH, HEIGHT, COLS, ROWS,
-    LANE_COLORS, COLOR_TREE,
-    MAX_GEN_AHEAD,
+    TILE, WIDTH, COLS, ROWS,
+    MAX_GEN_AHEAD, LANE_WINDOW, GEN_CHUNK_ROWS,
 )
-from entities import Player, Car, Log, Train
-from utils import clamp
+from dangermap import DangerMap
+from entities import Player, DEATH_CAR, DEATH_TRAIN, DEATH_DROWNED, DEATH_SWEPT
+from lanetypes import (
+    LaneType, LANE_TYPES, LANE_GRASS, COLLIDE_HIT, COLLIDE_RIDE, kind_from_draw,
+)
+from movers import (
+    MoverTable, KIND_CAR, KIND_TRAIN, N_KINDS, CAR_PALETTE, CULL_MARGIN_PX, is_culled,
+)
+from utils import clamp, iter_bits, flood_bits
+
+START_GRASS_ROWS = 6   # rows 0..5 are always grass
+OPEN_START_ROWS = 3    # rows 0..2 have no trees
+MAX_DANGER_RUN = 3     # at most this many non-grass lanes in a row
+ALL_COLS = (1 << COLS) - 1
 
 @dataclass
 class Lane:
     gy: int
-    kind: str  # "grass" | "road" | "water" | "rail"
-
-    # Moving objects
-    movers: list = None
-
-    # For grass obstacles
-    blocked_x: set[int] = None
-
-    # Spawning
-    spawn_timer: float = 0.0
-    spawn_interval: float = 1.0
+    kind: int  # LANE_* (lanetypes.py)
+    ltype: LaneType = LANE_TYPES[LANE_GRASS]   # resolved from kind when the row is generated
+
+    # For grass obstacles: bit gx set = tree in column gx
+    blocked_mask: int = 0
+    # Columns reachable from the start (see validate_trees); traffic rows: all
+    reach_mask: int = 0
+
+    # Spawning. Traffic runs on its kind's phase clock (see World.phase): spawn k of
+    # this lane happens at phase spawn_phase0 + k * spawn_period, so the whole lane is
+    # a function of the clock and never needs stepping while off screen.
+    spawn_interval: float = 1.0   # seconds between spawns at speed multiplier 1
+    spawn_period: float = 1.0     # phase units between spawns
+    spawn_phase0: float = 0.0
+    next_spawn: int = 0           # first spawn index not yet in the mover table
     speed_px: float = 120.0
     direction: int = 1
     mover_min_w: int = 1
     mover_max_w: int = 2
 
-    # rail special behavior
-    rail_cooldown: float = 0.0
-
-    def __post_init__(self):
-        if self.movers is None:
-            self.movers = []
-        if self.blocked_x is None:
-            self.blocked_x = set()
-
-    def setup(self):
-        # Choose parameters based on lane kind
-        self.direction = random.choice([-1, 1])
-
-        if self.kind == "grass":
+    # World seed; spawn k of this lane draws from (seed, gy, STREAM_SPAWN, k)
+    seed: int = 0
+
+    def reset(self, gy: int, kind: int, seed: int = 0) -> None:
+        """Reinitialise a pooled lane slot for a new row."""
+        self.gy = gy
+        self.kind = kind
+        self.ltype = LANE_TYPES[kind]
+        self.seed = seed
+        self.blocked_mask = 0
+        self.reach_mask = ALL_COLS
+        self.spawn_interval = 1.0
+        self.spawn_period = 1.0
+        self.spawn_phase0 = 0.0
+        self.next_spawn = 0
+        self.speed_px = 120.0
+        self.direction = 1
+        self.mover_min_w, self.mover_max_w = 1, 2
+
+    def assign(self, other: Lane) -> None:
+        """Copy another lane's state into this pooled slot."""
+        self.__dict__.update(other.__dict__)
+
+    def is_blocked(self, gx: int) -> bool:
+        return (self.blocked_mask >> gx) & 1 == 1
+
+    def setup(self, rng: KeyedRandom):
+        # Choose parameters based on lane type
+        t = self.ltype
+        self.direction = rng.choice([-1, 1])
+
+        if t.trees is not None:
             # Trees block movement; keep at least one path open
-            density = random.randint(2, 5)
+            density = rng.randint(*t.trees)
             xs = list(range(COLS))
-            random.shuffle(xs)
-            self.blocked_x = set(xs[:density])
-
-        elif self.kind == "road":
-            self.spawn_interval = random.uniform(0.7, 1.2)
-            self.speed_px = random.uniform(140, 240)
-            self.mover_min_w, self.mover_max_w = 1, 2
-
-        elif self.kind == "water":
-            self.spawn_interval = random.uniform(0.8, 1.3)
-            self.speed_px = random.uniform(90, 170)
-            self.mover_min_w, self.mover_max_w = 2, 3
-
-        elif self.kind == "rail":
-            # Trains are rarer but wide and dangerous
-            self.spawn_interval = random.uniform(3.0, 5.0)
-            self.speed_px = random.uniform(220, 320)
-            self.mover_min_w, self.mover_max_w = 4, 6
-            self.rail_cooldown = random.uniform(0.0, 1.5)
-
-    def spawn_one(self, speed_mult: float):
-        w = random.randint(self.mover_min_w, self.mover_max_w)
-        w_px = w * TILE
-
-        if self.direction == 1:
-            x0 = -w_px - random.uniform(0, TILE * 2)
-        else:
-            x0 = WIDTH + random.uniform(0, TILE * 2)
-
-        cur_speed = self.speed_px * speed_mult
-
-        if self.kind == "road":
-            self.movers.append(Car(x_px=x0, gy=self.gy, w_tiles=w, speed_px=cur_speed,
-                                direction=self.direction, base_speed_px=self.speed_px))
-        elif self.kind == "water":
-            self.movers.append(Log(x_px=x0, gy=self.gy, w_tiles=w, speed_px=cur_speed,
-                                direction=self.direction, base_speed_px=self.speed_px))
-        elif self.kind == "rail":
-            self.movers.append(Train(x_px=x0, gy=self.gy, w_tiles=w, speed_px=cur_speed,
-                                    direction=self.direction, base_speed_px=self.speed_px))
-
-
-    def update(self, dt: float, score: int) -> None:
-        if self.kind not in ("road", "water", "rail"):
-            return
-
-        speed_mult = difficulty.lane_speed_multiplier(self.kind, score)
-
+            rng.shuffle(xs)
+            self.blocked_mask = 0
+            for gx in xs[:density]:
+                self.blocked_mask |= 1 << gx
+
+        if t.mover_kind is not None:
+            self.spawn_interval = rng.uniform(*t.spawn_interval)
+            self.speed_px = rng.uniform(*t.speed)
+            self.mover_min_w, self.mover_max_w = t.mover_w
+            self.spawn_period = self.period_for(difficulty.TUNING.profiles[t.mover_kind].mult(self.gy))
+            # Lanes don't all spawn in step
+            self.spawn_phase0 = rng.uniform(0.0, self.spawn_period)
+
+    def period_for(self, speed_mult: float) -> float:
+        """Spawn period in phase units for a lane running at speed_mult.
+
+        The lane is evaluated at the multiplier the player will have on reaching it
+        (score == gy), which keeps the period a pure function of the row.
+        """
         # ✅ 核心：按速度缩放生成间隔，保持密度稳定
         # spawn_rate ∝ speed  =>  interval ∝ 1/speed
         # 额外加上下限避免极端情况
-        safe_mult = max(0.20, speed_mult)  # 防止除以很小的数导致间隔爆大
+        tuning = difficulty.TUNING
+        safe_mult = max(tuning.min_speed_mult, speed_mult)  # 防止除以很小的数导致间隔爆大
         interval_eff = self.spawn_interval / safe_mult
 
-        # 你可以调这两个阈值：
-        interval_eff = max(0.35, min(interval_eff, 4.00))
+        # 你可以调这两个阈值（difficulty.Tuning）：
+        interval_eff = max(tuning.min_spawn_interval, min(interval_eff, tuning.max_spawn_interval))
+        return interval_eff * speed_mult
 
-        self.spawn_timer += dt
+    def spawn_params(self, k: int) -> tuple[int, float, float, int]:
+        """(w_tiles, x0, t0, color) of spawn k: where and when it enters, as drawn from its key."""
+        rng = KeyedRandom(self.seed, self.gy, STREAM_SPAWN, k)
 
-        # Rail: 保留冷却逻辑，但用 interval_eff 来刷车
-        if self.kind == "rail" and self.rail_cooldown > 0:
-            self.rail_cooldown -= dt
+        w = rng.randint(self.mover_min_w, self.mover_max_w)
+        w_px = w * TILE
+
+        if self.direction == 1:
+            x0 = -w_px - rng.uniform(0, TILE * 2)
         else:
-            while self.spawn_timer >= interval_eff:
-                self.spawn_timer -= interval_eff
-                self.spawn_one(speed_mult)
-
-        # Update movers & cull offscreen
-        keep = []
-        for m in self.movers:
-            base = m.base_speed_px if getattr(m, "base_speed_px", 0.0) > 0 else self.speed_px
-            m.speed_px = base * speed_mult
-            m.update(dt)
-
-            rect = m.rect_world()
-            if rect.right < -TILE * 8 or rect.left > WIDTH + TILE * 8:
-                continue
-            keep.append(m)
-        self.movers = keep
-
-
-
-    def draw(self, screen: pygame.Surface, camera_y_px: float):
-        lane_color = LANE_COLORS[self.kind]
-        y = self.gy * TILE
-        screen_y = HEIGHT - (y - camera_y_px) - TILE
-
-        # Base
-        pygame.draw.rect(screen, lane_color, (0, screen_y, WIDTH, TILE))
-
-        # Texture / details
-        if self.kind == "grass":
-            # dots/flowers
-            for i in range(0, WIDTH, TILE // 2):
-                pygame.draw.circle(screen, (70, 165, 80), (i + (self.gy * 7) % (TILE//2), screen_y + TILE//3), 2)
-                pygame.draw.circle(screen, (55, 125, 65), (i + (self.gy * 11) % (TILE//2), screen_y + 2*TILE//3), 2)
-
-            # Trees
-            for gx in self.blocked_x:
-                tx = gx * TILE
-                trunk = pygame.Rect(tx + TILE//2 - 4, screen_y + TILE//2, 8, TILE//2 - 4)
-                pygame.draw.rect(screen, (95, 70, 40), trunk, border_radius=3)
-                pygame.draw.circle(screen, COLOR_TREE, (tx + TILE//2, screen_y + TILE//2), TILE//3)
-                pygame.draw.circle(screen, (25, 75, 30), (tx + TILE//2 - 6, screen_y + TILE//2 + 2), TILE//4)
-
-        elif self.kind == "road":
-            # dashed center line
-            dash_w = TILE // 2
-            for x in range(0, WIDTH, dash_w * 2):
-                pygame.draw.rect(screen, (220, 220, 220), (x + dash_w//2, screen_y + TILE//2 - 2, dash_w, 4))
-
-            # subtle curb
-            pygame.draw.line(screen, (30, 30, 35), (0, screen_y), (WIDTH, screen_y), 2)
-
-            for m in self.movers:
-                m.draw(screen, camera_y_px)
-
-        elif self.kind == "water":
-            # waves
-            for x in range(0, WIDTH, TILE//2):
-                pygame.draw.arc(
-                    screen, (200, 230, 255),
-                    pygame.Rect(x, screen_y + TILE//3, TILE//2, TILE//2),
-                    0, 3.14159, 2
-                )
-            for m in self.movers:
-                m.draw(screen, camera_y_px)
-
-        elif self.kind == "rail":
-            # sleepers
-            for x in range(0, WIDTH, TILE//2):
-                pygame.draw.rect(screen, (110, 85, 60), (x, screen_y + TILE//2 - 3, TILE//3, 6))
-            # rails
-            pygame.draw.line(screen, (190, 190, 190), (0, screen_y + TILE//3), (WIDTH, screen_y + TILE//3), 3)
-            pygame.draw.line(screen, (190, 190, 190), (0, screen_y + 2*TILE//3), (WIDTH, screen_y + 2*TILE//3), 3)
-
-            for m in self.movers:
-                m.draw(screen, camera_y_px)
+            x0 = WIDTH + rng.uniform(0, TILE * 2)
+
+        color = rng.randrange(len(CAR_PALETTE)) if self.ltype.mover_kind == KIND_CAR else 0
+        return w, x0, self.spawn_phase0 + k * self.spawn_period, color
+
+    def spawn_one(self, k: int, phase: float, speed_mult: float, movers: MoverTable) -> None:
+        """Add spawn k where it is at the given phase, unless it is already off screen."""
+        w, x0, t0, color = self.spawn_params(k)
+        x = x0 + self.direction * self.speed_px * (phase - t0)
+        left = int(x)
+        if is_culled(left, left + w * TILE):
+            return
+        movers.add(x, self.gy, w, self.speed_px, self.speed_px * speed_mult,
+                   self.direction, self.ltype.mover_kind, color, x0, t0)
+
+    def spawn_due(self, phase: float, speed_mult: float, movers: MoverTable) -> None:
+        """Add the spawns whose time has come since the last call."""
+        k = self.next_spawn
+        while self.spawn_phase0 + k * self.spawn_period <= phase:
+            self.spawn_one(k, phase, speed_mult, movers)
+            k += 1
+        self.next_spawn = k
+
+    def first_live_spawn(self, phase: float) -> int:
+        """Lowest spawn index that can still be on (or near) screen at the given phase.
+
+        A mover travels at most CULL_MARGIN_PX + WIDTH + the widest spawn offset
+        before it is culled, which bounds how many spawns back to look.
+        """
+        reach = WIDTH + CULL_MARGIN_PX + (self.mover_max_w + 2) * TILE
+        return math.ceil((phase - reach / self.speed_px - self.spawn_phase0) / self.spawn_period)
+
+    def materialize(self, phase: float, speed_mult: float, movers: MoverTable) -> None:
+        """Add every mover that is on (or near) screen at the given phase."""
+        self.next_spawn = self.first_live_spawn(phase)
+        self.spawn_due(phase, speed_mult, movers)
+
+
+def raw_lane_kind(seed: int, gy: int) -> int:
+    # Weighted random over the registry (see LaneType.upto)
+    return kind_from_draw(unit_float(seed, gy, STREAM_KIND))
+
+def lane_kind(seed: int, gy: int) -> int:
+    """Kind of row gy, without generating the rows before it.
+
+    Sequentially, a grass lane is forced after MAX_DANGER_RUN dangerous lanes in a row.
+    Counting back to the nearest sampled grass row (expected < 2 steps) tells us where
+    gy falls in that cycle, so the same guarantee holds with O(1) expected work.
+    """
+    if gy < START_GRASS_ROWS:
+        return LANE_GRASS
+    run = 0
+    while gy - run >= START_GRASS_ROWS and raw_lane_kind(seed, gy - run) != LANE_GRASS:
+        run += 1
+    if run % (MAX_DANGER_RUN + 1) == 0:
+        return LANE_GRASS
+    return raw_lane_kind(seed, gy)
+
+def build_lane(seed: int, gy: int, lane: Lane | None = None, below: Lane | None = None) -> Lane:
+    """(Re)generate row gy into lane (a new Lane if None); exact for any gy.
+
+    Pure function of (seed, gy), so it is safe to call from the generator thread.
+    below, if it is row gy - 1 of this seed, saves rebuilding it for the reachability check.
+    """
+    if lane is None:
+        lane = Lane(gy=gy, kind=LANE_GRASS)
+    lane.reset(gy, lane_kind(seed, gy), seed)
+    lane.setup(KeyedRandom(seed, gy, STREAM_LANE))
+    # Make first lanes more open
+    if gy < OPEN_START_ROWS:
+        lane.blocked_mask = 0
+
+    if lane.ltype.trees is not None:
+        validate_trees(seed, lane, below)
+    return lane
+
+def validate_trees(seed: int, lane: Lane, below: Lane | None = None) -> None:
+    """Set lane.reach_mask and make sure it isn't empty.
+
+    Traffic rows have no static obstacles, so only a run of grass rows can cut the
+    board: a grass row is reachable where it is free above a reachable cell of the
+    row below, spread sideways through free cells. If trees cover every reachable
+    column, the one over the reachable column nearest the middle is removed.
+    """
+    gy = lane.gy
+    if gy == 0 or LANE_TYPES[lane_kind(seed, gy - 1)].trees is None:
+        reach_below = ALL_COLS
+    elif below is not None and below.gy == gy - 1 and below.seed == seed:
+        reach_below = below.reach_mask
+    else:
+        reach_below = build_lane(seed, gy - 1).reach_mask   # recurses down to the run start
+
+    free = ALL_COLS & ~lane.blocked_mask
+    reach = flood_bits(reach_below, free)
+    if reach == 0:
+        gx = min(iter_bits(reach_below), key=lambda x: abs(x - COLS // 2))
+        lane.blocked_mask &= ~(1 << gx)
+        reach = flood_bits(reach_below, free | (1 << gx))
+    lane.reach_mask = reach
 
 
 class World:
-    def __init__(self):
-        self.lanes: dict[int, Lane] = {}
+    def __init__(self, seed: int | None = None, start_gy: int = 0, background_gen: bool = False):
+        # Rows built ahead by a worker thread (lanegen.py), waiting to be copied into the ring
+        self.generator = None
+        self.pending: dict[int, Lane] = {}
+        if background_gen:
+            from lanegen import LaneGenerator
+            self.generator = LaneGenerator(GEN_CHUNK_ROWS)
+
+        # Fixed ring of pooled lanes: row gy lives in slot gy % LANE_WINDOW, so
+        # generating a new row at the top evicts the row LANE_WINDOW below it.
+        self.lanes: list[Lane] = [Lane(gy=-1, kind=LANE_GRASS) for _ in range(LANE_WINDOW)]
+        self.movers = MoverTable()
+        # Per-kind phase clocks: the integral of the speed multiplier over time. Traffic
+        # positions and spawns are functions of these, so lanes only cost anything
+        # while they are in view, and arrive in view already in steady state.
+        self.phase = np.zeros(N_KINDS)
+        self._danger: DangerMap | None = None
+        self.reset(seed, start_gy)
+
+    def reset(self, seed: int | None = None, start_gy: int = 0) -> None:
+        """Start over as a new world, reusing the lane pool and mover table."""
+        # Keys are hashed mod 2**64 (rng.py), so this is the same world for any int seed,
+        # and snapshots and replays can store it unsigned.
+        self.seed = random.getrandbits(32) if seed is None else seed & MASK64
+        self.pending.clear()
+        self.movers.clear()
+        self.phase[:] = 0.0
         self.highest_gen_gy = -1
-        self.last_safe_gap = 0  # count since last grass lane generated
-
-        # Ensure starting area: a few grass lanes
-        for gy in range(0, 6):
-            lane = Lane(gy=gy, kind="grass")
-            lane.setup()
-            # Make first lane more open
-            if gy <= 2:
-                lane.blocked_x = set()
-            self.lanes[gy] = lane
-            self.highest_gen_gy = max(self.highest_gen_gy, gy)
-            self.last_safe_gap = 0
-
-    def lane_kind_sampler(self) -> str:
-        # Force a grass lane if too many dangerous lanes in a row
-        if self.last_safe_gap >= 3:
-            return "grass"
-
-        # Weighted random
-        r = random.random()
-        # more roads/grass, occasional water, rare rail
-        if r < 0.42:
-            return "grass"
-        elif r < 0.80:
-            return "road"
-        elif r < 0.95:
-            return "water"
-        else:
-            return "rail"
+        self.lowest_gy = 0  # lowest row still in the window; everything below was evicted
+        # Rows whose movers are materialized in self.movers (empty when view_min > view_max)
+        self.view_min, self.view_max = 0, -1
+        # Rows outside that view also materialized because agents stand on them (crowd.py)
+        self.held: list[int] = []
+
+        # Every row is a pure function of (seed, gy), so a deep start skips straight there.
+        if start_gy > 0:
+            self.highest_gen_gy = start_gy - 1
+            self.lowest_gy = start_gy
+        self.ensure_generated(0, max(start_gy, START_GRASS_ROWS - 1))
+
+    def build_lane(self, gy: int, lane: Lane | None = None, below: Lane | None = None) -> Lane:
+        return build_lane(self.seed, gy, lane, below)
 
     def ensure_generated(self, min_gy: int, max_gy: int) -> None:
         # Generate missing lanes in [min_gy, max_gy]
+        if self.highest_gen_gy >= max_gy:
+            return
+        # Jumping more than a full window ahead: skip the rows that would be evicted anyway.
+        if max_gy - self.highest_gen_gy > LANE_WINDOW:
+            self.highest_gen_gy = max_gy - LANE_WINDOW
+        if self.generator is not None:
+            self.collect_generated(max_gy)
+        lanes = self.lanes
         while self.highest_gen_gy < max_gy:
             gy = self.highest_gen_gy + 1
-            kind = self.lane_kind_sampler()
-            lane = Lane(gy=gy, kind=kind)
-            lane.setup()
-
-            # A little design constraint: water lane should not be the very first dangerous lane too early
-            if gy < 6 and kind == "water":
-                lane.kind = "road"
-                lane.setup()
-
-            self.lanes[gy] = lane
-            self.highest_gen_gy = gy
-
-            if lane.kind == "grass":
-                self.last_safe_gap = 0
+            ready = self.pending.pop(gy, None)
+            if ready is not None:
+                lanes[gy % LANE_WINDOW].assign(ready)
             else:
-                self.last_safe_gap += 1
+                self.build_lane(gy, lanes[gy % LANE_WINDOW], lanes[(gy - 1) % LANE_WINDOW])
+            self.highest_gen_gy = gy
 
-        # We keep old lanes too (simple); could prune if you want.
+        # Rows that fell out of the window take their movers with them.
+        lowest = max(0, self.highest_gen_gy - LANE_WINDOW + 1)
+        if lowest > self.lowest_gy:
+            self.lowest_gy = lowest
+            stale = self.movers.gy < lowest
+            if stale.any():
+                self.movers.compact(~stale)
+
+    def collect_generated(self, max_gy: int) -> None:
+        """Take finished chunks from the worker and keep it GEN_CHUNK_ROWS * 2 rows ahead."""
+        gen = self.generator
+        for gy in [gy for gy in self.pending if gy <= self.highest_gen_gy]:
+            del self.pending[gy]   # skipped by a jump
+        while True:
+            try:
+                seed, chunk = gen.ready.get_nowait()
+            except queue.Empty:
+                break
+            if seed == self.seed:
+                for lane in chunk:
+                    if lane.gy > self.highest_gen_gy:
+                        self.pending[lane.gy] = lane
+        gen.request(self.seed, self.highest_gen_gy + 1, max_gy + GEN_CHUNK_ROWS * 2)
+
+    def close(self) -> None:
+        if self.generator is not None:
+            self.generator.close()
+            self.generator = None
 
     def get_lane(self, gy: int) -> Lane:
-        if gy not in self.lanes:
+        if gy > self.highest_gen_gy:
             # generate up to this gy
             self.ensure_generated(0, gy)
-        return self.lanes[gy]
+        if gy < self.lowest_gy:
+            # Evicted: regenerate its static layout (trees, speeds) outside the window
+            return self.build_lane(gy)
+        return self.lanes[gy % LANE_WINDOW]
+
+    def danger_map(self, center_gy: int) -> DangerMap:
+        """The world's DangerMap brought up to date around row center_gy (see dangermap.py)."""
+        if self._danger is None:
+            self._danger = DangerMap()
+        return self._danger.update(self, center_gy)
 
     def can_step_to(self, gx: int, gy: int) -> bool:
         if gx < 0 or gx >= COLS:
             return False
-        if gy < 0:
+        if gy < self.lowest_gy:
             return False
         lane = self.get_lane(gy)
-        if lane.kind == "grass" and gx in lane.blocked_x:
+        if lane.is_blocked(gx):
             return False
         return True
 
-    def update(self, dt: float, camera_y_px: float, score: int) -> None:
+    def update(self, dt: float, camera_y_px: float, score: int, hold=None, view: bool = True) -> None:
+        """Advance traffic. hold: rows outside the camera's view that must have their
+        movers too (rows holding crowd agents); other rows outside it are dropped.
+        view=False drops the view's rows as well, leaving movers on the hold rows only
+        (a headless crowd): lanes are closed-form, so a row is materialized exactly
+        when an agent steps onto it."""
         min_visible_gy = int(camera_y_px // TILE) - 4
         max_visible_gy = int(camera_y_px // TILE) + ROWS + 8
 
         max_visible_gy = max(max_visible_gy, 0)
         self.ensure_generated(0, max_visible_gy + MAX_GEN_AHEAD)
-
-        for gy in range(max(0, min_visible_gy), max_visible_gy + 1):
-            lane = self.get_lane(gy)
-            lane.update(dt, score)
-
-
-    def draw(self, screen: pygame.Surface, camera_y_px: float) -> None:
-        min_visible_gy = int(camera_y_px // TILE) - 2
-        max_visible_gy = int(camera_y_px // TILE) + ROWS + 2
-
-        for gy in range(max(0, min_visible_gy), max_visible_gy + 1):
-            self.get_lane(gy).draw(screen, camera_y_px)
+        lo = max(self.lowest_gy, min_visible_gy)
+        if not view:
+            lo, max_visible_gy = self.lowest_gy, self.lowest_gy - 1   # empty view
+
+        kind_mult = np.asarray(difficulty.mover_multipliers(score))
+        phase = self.phase
+        phase += kind_mult * dt
+
+        held = []
+        if hold is not None:
+            held = [gy for gy in hold if gy >= self.lowest_gy and not lo <= gy <= max_visible_gy]
+
+        # One vectorized pass: re-evaluate positions, drop lanes that left the view, cull
+        self.movers.advance(phase, kind_mult, lo, max_visible_gy, held)
+
+        lanes = self.lanes
+        was_held = set(self.held)
+        for gy in itertools.chain(range(lo, max_visible_gy + 1), held):
+            lane = lanes[gy % LANE_WINDOW]
+            kind = lane.ltype.mover_kind
+            if kind is None:
+                continue
+            if self.view_min <= gy <= self.view_max or gy in was_held:
+                lane.spawn_due(phase[kind], kind_mult[kind], self.movers)
+            else:
+                lane.materialize(phase[kind], kind_mult[kind], self.movers)
+        self.view_min, self.view_max = lo, max_visible_gy
+        self.held = held
 
 
     def check_collisions_and_water(self, player: Player, dt: float) -> None:
         lane = self.get_lane(player.gy)
 
-        # Reset drift when not on water so it doesn't leak across lanes.
-        if lane.kind != "water" and hasattr(player, "_drift_px"):
-            player._drift_px = 0.0  # type: ignore[attr-defined]
-
-        pr = player.rect_world()
+        rule = lane.ltype.collision
 
-        if lane.kind == "road":
-            for m in lane.movers:
-                if pr.colliderect(m.rect_world()):
-                    player.alive = False
-                    return
-
-        elif lane.kind == "rail":
-            for m in lane.movers:
-                if pr.colliderect(m.rect_world()):
-                    player.alive = False
-                    return
+        # Reset drift when not on water so it doesn't leak across lanes.
+        if rule != COLLIDE_RIDE:
+            player.drift_px = 0.0
+
+        movers = self.movers
+        a, b = player.span_x()
+
+        if rule == COLLIDE_HIT:
+            # Swept test: widen the player by how far this lane's traffic moves in a tick,
+            # so a fast mover can't jump over the player between two checks. Taken from the
+            # lane's speed, not x - prev_x, which is 0 for a mover spawned this tick.
+            lo, hi = movers.lane_bounds(player.gy)
+            if lo < hi:
+                d = float(movers.speed[lo] * dt * movers.direction[lo])
+                a += int(min(d, 0.0))
+                b += int(max(d, 0.0) + 0.999)
+            j = movers.first_overlap(player.gy, a, b)
+            if j >= 0:
+                player.alive = False
+                player.death = DEATH_TRAIN if movers.kind[j] == KIND_TRAIN else DEATH_CAR
+                return
 
-        elif lane.kind == "water":
+        elif rule == COLLIDE_RIDE:
             # Continuous-ish contact: use leftover drift (< TILE) to build a more accurate
-            # collision rect while logs slide within a tile. This prevents "falling off early".
-            if not hasattr(player, "_drift_px"):
-                player._drift_px = 0.0  # type: ignore[attr-defined]
-
-            def player_rect_with_drift() -> pygame.Rect:
-                x = player.gx * TILE + float(player._drift_px)  # type: ignore[attr-defined]
-                return pygame.Rect(int(x), player.gy * TILE, TILE, TILE)
-
-            def is_on_any_log() -> bool:
-                pr2 = player_rect_with_drift()
-                for mm in lane.movers:
-                    if pr2.colliderect(mm.rect_world()):
-                        return True
-                return False
+            # collision span while logs slide within a tile. This prevents "falling off early".
+            def log_under() -> int:
+                x = int(player.gx * TILE + player.drift_px)
+                return movers.first_overlap(player.gy, x, x + TILE)
 
             # If you step/jump into water without a log under you -> immediate death.
-            if not is_on_any_log():
-                player.alive = False
-                return
-
-            # Find the log we're currently riding.
-            on_log = None
-            pr2 = player_rect_with_drift()
-            for m in lane.movers:
-                if pr2.colliderect(m.rect_world()):
-                    on_log = m
-                    break
-            if on_log is None:
+            on_log = log_under()
+            if on_log < 0:
                 player.alive = False
+                player.death = DEATH_DROWNED
                 return
 
-            # Carry by the log movement this frame.
-            player._drift_px += on_log.speed_px * dt * on_log.direction  # type: ignore[attr-defined]
+            # Carry by the log movement this frame, in closed form.
+            player.drift_px += float(movers.speed[on_log] * dt * movers.direction[on_log])
 
             # --- Screen-edge blocking ---
             # Rule: if log would carry you out of bounds, you stop at the edge (no instant death).
             # You only die once there is no log under you (i.e., log floats away leaving water).
-            while player._drift_px >= TILE:  # type: ignore[attr-defined]
-                if player.gx >= COLS - 1:
-                    player._drift_px = 0.0  # type: ignore[attr-defined]
-                    break
-                player._drift_px -= TILE  # type: ignore[attr-defined]
-                player.gx += 1
-
-            while player._drift_px <= -TILE:  # type: ignore[attr-defined]
-                if player.gx <= 0:
-                    player._drift_px = 0.0  # type: ignore[attr-defined]
-                    break
-                player._drift_px += TILE  # type: ignore[attr-defined]
-                player.gx -= 1
+            steps = int(player.drift_px / TILE)  # whole tiles crossed, truncated toward zero
+            if steps:
+                gx = player.gx + steps
+                if gx > COLS - 1:
+                    player.gx, player.drift_px = COLS - 1, 0.0
+                elif gx < 0:
+                    player.gx, player.drift_px = 0, 0.0
+                else:
+                    player.gx = gx
+                    player.drift_px -= steps * TILE
 
             # Also block sub-tile drift into the wall.
-            if player.gx <= 0 and player._drift_px < 0:  # type: ignore[attr-defined]
-                player._drift_px = 0.0  # type: ignore[attr-defined]
-            if player.gx >= COLS - 1 and player._drift_px > 0:  # type: ignore[attr-defined]
-                player._drift_px = 0.0  # type: ignore[attr-defined]
+            if player.gx <= 0 and player.drift_px < 0:
+                player.drift_px = 0.0
+            if player.gx >= COLS - 1 and player.drift_px > 0:
+                player.drift_px = 0.0
 
             # After carry/blocking, if not on any log -> water -> death.
-            if not is_on_any_log():
+            if log_under() < 0:
                 player.alive = False
+                player.death = DEATH_SWEPT
                 return